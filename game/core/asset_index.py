@@ -0,0 +1,54 @@
+# game/core/asset_index.py
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class AssetIndex:
+    """
+    A snapshot of every file under an assets folder, taken with one os.walk,
+    so existence checks and directory listings are set and dict lookups
+    instead of filesystem calls. Paths are relative, with forward slashes.
+    Call refresh() after adding or removing files while the game runs.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._files = None
+        self._dirs = None
+
+    def refresh(self):
+        """Walks the assets folder again."""
+        files = set()
+        dirs = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            relative_dir = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+            relative_dir = "" if relative_dir == "." else relative_dir
+            dirs[relative_dir] = sorted(filenames)
+            prefix = f"{relative_dir}/" if relative_dir else ""
+            files.update(prefix + name for name in filenames)
+        self._files = files
+        self._dirs = dirs
+        logger.debug("Indexed %d files in %d folders under %s", len(files), len(dirs), self.root)
+
+    def _ensure(self):
+        if self._files is None:
+            self.refresh()
+
+    def exists(self, path):
+        """True if path is a file in the index."""
+        self._ensure()
+        return path in self._files
+
+    def is_dir(self, path):
+        self._ensure()
+        return path.rstrip("/") in self._dirs
+
+    def list_dir(self, path, suffix=None):
+        """Sorted file names in a folder (not subfolders), optionally by suffix."""
+        self._ensure()
+        names = self._dirs.get(path.rstrip("/"), [])
+        if suffix:
+            names = [name for name in names if name.endswith(suffix)]
+        return names
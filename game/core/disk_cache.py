@@ -0,0 +1,141 @@
+# game/core/disk_cache.py
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# magic, width, height, source size, source mtime (ns), source sha1
+_HEADER = struct.Struct("<8sIIqq20s")
+_MAGIC = b"CFIMG\x00\x00\x01"
+_MTIME_OFFSET = struct.calcsize("<8sIIq")
+# Pixel data starts on a round offset after the header
+_DATA_OFFSET = 64
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.digest()
+
+class MappedImage:
+    """
+    A cached image whose pixels are still in the memory-mapped cache file.
+    convert_alpha() copies them into a display-format surface and unmaps
+    the file, so it can be used in place of a freshly decoded surface.
+    """
+
+    def __init__(self, file, mapping, size):
+        self._file = file
+        self._mapping = mapping
+        self._size = size
+
+    def convert_alpha(self):
+        view = memoryview(self._mapping)[_DATA_OFFSET:]
+        try:
+            surface = pygame.image.frombuffer(view, self._size, "RGBA")
+            image = surface.convert_alpha()
+            # frombuffer surfaces keep the buffer exported until they go away
+            del surface
+        finally:
+            view.release()
+            self._mapping.close()
+            self._file.close()
+        return image
+
+class DiskImageCache:
+    """
+    Keeps decoded and scaled images on disk as raw RGBA, one file per
+    (source file, scale). Each entry records the size, mtime and hash of
+    the source it was made from and is ignored once the source changes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, source_path, scale):
+        name = hashlib.sha1(f"{os.path.abspath(source_path)}|{scale!r}".encode()).hexdigest()
+        return self.directory / f"{name}.rgba"
+
+    def load(self, source_path, scale):
+        """Returns a MappedImage for an up to date entry, or None."""
+        if not self.enabled:
+            return None
+        entry_path = self._entry_path(source_path, scale)
+        try:
+            stat = os.stat(source_path)
+            f = open(entry_path, "rb")
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            self.misses += 1
+            return None
+
+        valid = False
+        if len(mapping) >= _DATA_OFFSET:
+            magic, width, height, size, mtime, digest = _HEADER.unpack_from(mapping)
+            valid = magic == _MAGIC and len(mapping) == _DATA_OFFSET + width * height * 4
+            if valid and (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+                # Touched but maybe not changed (e.g. a fresh checkout); compare contents.
+                valid = size == stat.st_size and digest == _file_hash(source_path)
+                if valid:
+                    self._update_mtime(entry_path, stat.st_mtime_ns)
+
+        if not valid:
+            mapping.close()
+            f.close()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return MappedImage(f, mapping, (width, height))
+
+    def _update_mtime(self, entry_path, mtime):
+        """Records a new source mtime so the next load can skip hashing."""
+        try:
+            with open(entry_path, "r+b") as f:
+                f.seek(_MTIME_OFFSET)
+                f.write(struct.pack("<q", mtime))
+        except OSError:
+            pass
+
+    def store(self, source_path, scale, image):
+        """Writes image (decoded from source_path at scale) to the cache."""
+        if not self.enabled:
+            return
+        entry_path = self._entry_path(source_path, scale)
+        temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.{id(image)}.tmp")
+        try:
+            stat = os.stat(source_path)
+            header = _HEADER.pack(_MAGIC, image.get_width(), image.get_height(),
+                                  stat.st_size, stat.st_mtime_ns, _file_hash(source_path))
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(header.ljust(_DATA_OFFSET, b"\0"))
+                f.write(pygame.image.tobytes(image, "RGBA"))
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            logger.warning("Image disk cache disabled, could not write %s: %s", entry_path, e)
+            self.enabled = False
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Deletes every cache entry."""
+        if self.directory.is_dir():
+            for entry_path in self.directory.glob("*.rgba"):
+                entry_path.unlink()
@@ -39,6 +39,10 @@ class DraggableItem:
             self.rect.x = mouse_pos[0] - self.offset_x
             self.rect.y = mouse_pos[1] - self.offset_y
 
+    def report_dirty(self, dirty):
+        """Reports the item's rect when it moved, appeared or disappeared."""
+        dirty.track(self, self.rect if self.visible else None, self.image)
+
     def draw(self, screen):
         """Draw the item to the screen only if it's visible."""
         if self.visible:
@@ -0,0 +1,54 @@
+# game/core/font_manager.py
+
+import pygame
+from collections import OrderedDict
+from settings import TEXT_CACHE_SIZE
+
+def _color_key(color):
+    """Returns a hashable version of a color (pygame.Color is not hashable)."""
+    return tuple(color) if color is not None else None
+
+class FontManager:
+    """
+    Shares fonts and rendered text between all scenes.
+    Fonts are created once per (name, size), and rendered text surfaces are
+    kept in a bounded LRU cache so static labels are never rendered twice.
+    """
+
+    def __init__(self, text_cache_size=TEXT_CACHE_SIZE):
+        self._fonts = {}
+        self._text_cache = OrderedDict()
+        self.text_cache_size = text_cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, name, size):
+        """Returns the shared font for (name, size), looking it up only once."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, font, text, color, background=None, antialias=True):
+        """
+        Returns a rendered text surface, from the cache when possible.
+        The returned surface is shared, so callers must not draw onto it.
+        """
+        key = (font, text, _color_key(color), _color_key(background), antialias)
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self._text_cache[key] = surface
+        while len(self._text_cache) > self.text_cache_size:
+            self._text_cache.popitem(last=False)
+        return surface
+
+# Create a single, global instance
+fonts = FontManager()
@@ -0,0 +1,81 @@
+# game/core/frame_scheduler.py
+
+import time
+import pygame
+
+class FrameScheduler:
+    """
+    Paces the main loop. While anything is happening frames run at `fps`;
+    once a frame has been idle (see frame_done) for `idle_delay` seconds
+    the loop drops to `idle_fps` and sleeps in pygame.event.wait, so any
+    input wakes it at once. Also counts CPU time, to see what idling saves.
+    """
+
+    def __init__(self, clock, fps, idle_fps, idle_delay):
+        self.clock = clock
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self._idle_since = None
+        self._pending_events = []
+
+        self.frames = 0
+        self.idle_frames = 0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._window = (self._start_wall, self._start_cpu)
+        self._cpu_percent = 0.0
+
+    @property
+    def is_idle(self):
+        """True while running at the idle rate."""
+        return self._idle_since is not None and time.perf_counter() - self._idle_since >= self.idle_delay
+
+    def events(self):
+        """This frame's events, including any that woke the loop up."""
+        events, self._pending_events = self._pending_events + pygame.event.get(), []
+        return events
+
+    def frame_done(self, idle):
+        """
+        Call at the end of every frame with whether it was idle: nothing
+        redrawn and nothing waiting to change. Waits for the next frame.
+        """
+        self.frames += 1
+        if not idle:
+            self._idle_since = None
+        elif self._idle_since is None:
+            self._idle_since = time.perf_counter()
+
+        if self.is_idle:
+            self.idle_frames += 1
+            event = pygame.event.wait(int(1000 / self.idle_fps))
+            if event.type != pygame.NOEVENT:
+                # Input: back to full speed straight away.
+                self._pending_events.append(event)
+                self._idle_since = None
+            self.clock.tick()
+        else:
+            self.clock.tick(self.fps)
+        self._update_cpu()
+
+    def _update_cpu(self):
+        wall, cpu = time.perf_counter(), time.process_time()
+        window_wall, window_cpu = self._window
+        if wall - window_wall >= 1.0:
+            self._cpu_percent = 100.0 * (cpu - window_cpu) / (wall - window_wall)
+            self._window = (wall, cpu)
+
+    @property
+    def cpu_percent(self):
+        """Process CPU time as a share of wall time over the last second or so."""
+        return self._cpu_percent
+
+    def stats(self):
+        """Totals since start: frames, idle frames, CPU and wall seconds."""
+        return {
+            "frames": self.frames,
+            "idle_frames": self.idle_frames,
+            "cpu_seconds": time.process_time() - self._start_cpu,
+            "wall_seconds": time.perf_counter() - self._start_wall,
+        }
@@ -0,0 +1,126 @@
+# game/core/image_cache.py
+
+from collections import OrderedDict
+
+def surface_bytes(surface):
+    """Estimated memory used by a surface's pixels."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def category_of(key):
+    """The folder an image is filed under, e.g. 'backgrounds' or 'cats'."""
+    parts = key[0].split("/")
+    if parts[0] == "images" and len(parts) > 2:
+        return parts[1]
+    return parts[0] if len(parts) > 1 else "other"
+
+class CategoryStats:
+    """Memory and lookup counters for one category of images."""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ImageCache:
+    """
+    An LRU cache of loaded images, keyed by (path, scale), that holds at
+    most budget bytes of pixels. Pinned keys are never evicted, even if
+    that leaves the cache over budget; they can be pinned before they load.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.bytes_used = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._pins = {}
+        self._stats = {}
+
+    def _category_stats(self, key):
+        category = category_of(key)
+        if category not in self._stats:
+            self._stats[category] = CategoryStats()
+        return self._stats[category]
+
+    def get(self, key):
+        """Returns the cached image for key, or None on a miss."""
+        image = self._entries.get(key)
+        stats = self._category_stats(key)
+        if image is None:
+            stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        stats.hits += 1
+        return image
+
+    def put(self, key, image):
+        """Stores an image, then evicts unpinned images until within budget."""
+        if key in self._entries:
+            self._remove(key)
+        size = surface_bytes(image)
+        self._entries[key] = image
+        self._sizes[key] = size
+        self.bytes_used += size
+        stats = self._category_stats(key)
+        stats.count += 1
+        stats.bytes += size
+        self._evict()
+
+    def _remove(self, key):
+        del self._entries[key]
+        size = self._sizes.pop(key)
+        self.bytes_used -= size
+        stats = self._category_stats(key)
+        stats.count -= 1
+        stats.bytes -= size
+
+    def _evict(self):
+        if self.bytes_used <= self.budget:
+            return
+        for key in list(self._entries):
+            if self._pins.get(key):
+                continue
+            self._remove(key)
+            self._category_stats(key).evictions += 1
+            if self.bytes_used <= self.budget:
+                break
+
+    def pin(self, key):
+        """Protects key from eviction until a matching unpin()."""
+        self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key):
+        count = self._pins.get(key, 0) - 1
+        if count > 0:
+            self._pins[key] = count
+        else:
+            self._pins.pop(key, None)
+            self._evict()
+
+    def stats(self):
+        """Returns {category: CategoryStats} for every category seen so far."""
+        return dict(self._stats)
+
+    @property
+    def hit_rate(self):
+        hits = sum(stats.hits for stats in self._stats.values())
+        lookups = hits + sum(stats.misses for stats in self._stats.values())
+        return hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Drops every image, pinned or not (pins and counters are kept)."""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,47 +1,231 @@
 # game/core/resource_manager.py
 
+import json
+import logging
+import time
 import pygame
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from core.asset_index import AssetIndex
+from core.disk_cache import DiskImageCache
+from core.image_cache import ImageCache
+from settings import LOADER_THREADS, IMAGE_DISK_CACHE, IMAGE_CACHE_BUDGET_MB
+
+logger = logging.getLogger(__name__)
+
+def _scaled_size(image, scale):
+    """Returns the size load_image scales image to, or None for no scaling."""
+    if isinstance(scale, tuple) and len(scale) == 2:
+        return scale
+    if isinstance(scale, (int, float)):
+        return (int(image.get_width() * scale), int(image.get_height() * scale))
+    return None
+
+def _decode(full_path, scale, disk_cache=None):
+    """
+    Reads and scales an image without touching the display, so it can run
+    on a worker thread. The result still needs convert_alpha(). With a
+    disk_cache, a previously scaled copy is used when the source is unchanged.
+    """
+    if disk_cache:
+        cached = disk_cache.load(full_path, scale)
+        if cached:
+            return cached
+
+    image = pygame.image.load(str(full_path))
+    if image.get_bitsize() not in (24, 32):
+        # smoothscale only works on 24/32 bit surfaces (e.g. not paletted PNGs)
+        rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        rgba.blit(image, (0, 0))
+        image = rgba
+    size = _scaled_size(image, scale)
+    if size is not None:
+        image = pygame.transform.smoothscale(image, size)
+    if disk_cache:
+        disk_cache.store(full_path, scale, image)
+    return image
+
+class PreloadJob:
+    """
+    A batch of images being decoded on the loader threads. Call poll() once a
+    frame from the main thread; it converts the finished images and puts them
+    in the cache, so later load_image() calls for them are free.
+    """
+
+    def __init__(self, manager, entries):
+        self.manager = manager
+        self.total = len(entries)
+        self.done = 0
+        self.failed = []
+        self._pending = [(key, manager._executor.submit(_decode, manager.assets_path / key[0], key[1], manager.disk_cache))
+                         for key in entries]
+
+    @property
+    def progress(self):
+        """Fraction of the manifest that is ready, from 0.0 to 1.0."""
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return not self._pending
+
+    def poll(self, budget=None):
+        """
+        Finishes decoded images in manifest order until one is still being
+        decoded or budget seconds have passed. Returns the progress.
+        """
+        start = time.perf_counter()
+        while self._pending and self._pending[0][1].done():
+            key, future = self._pending.pop(0)
+            try:
+                self.manager.image_cache.put(key, future.result().convert_alpha())
+            except (FileNotFoundError, pygame.error) as e:
+                # The scene's own load_image call reports or falls back as usual.
+                self.failed.append((key[0], e))
+            self.done += 1
+            if budget is not None and time.perf_counter() - start >= budget:
+                break
+        return self.progress
+
+    def wait(self):
+        """Blocks until everything is loaded."""
+        while self._pending:
+            self._pending[0][1].result()
+            self.poll()
 
 class ResourceManager:
     def __init__(self):
         self.base_path = Path(__file__).parent.parent.parent
         self.assets_path = self.base_path / "assets"
-        self._image_cache = {}
+        # Loaded images, within a memory budget; scenes pin what they use.
+        self.image_cache = ImageCache(IMAGE_CACHE_BUDGET_MB * 1024 * 1024)
+        self._sheet_cache = {}
+        self._sheet_images = {}
+        # What's on disk, listed once; paths we already reported missing.
+        self.index = AssetIndex(self.assets_path)
+        self._missing = set()
+        self.disk_cache = DiskImageCache(self.base_path / "cache" / "images") if IMAGE_DISK_CACHE else None
+        self._executor = ThreadPoolExecutor(max_workers=LOADER_THREADS, thread_name_prefix="asset-loader")
+
+    def refresh_index(self):
+        """Rescans the assets folder, e.g. after adding files or moving assets_path."""
+        self.index = AssetIndex(self.assets_path)
+        self.index.refresh()
+        self._missing.clear()
+        self._sheet_images.clear()
+
+    def exists(self, path_from_assets):
+        """True if the asset is a file, checked against the asset index."""
+        if self.index.root != self.assets_path:
+            self.refresh_index()
+        return self.index.exists(path_from_assets)
+
+    def list_dir(self, path_from_assets, suffix=None):
+        """Sorted file names in an assets folder, from the asset index."""
+        if self.index.root != self.assets_path:
+            self.refresh_index()
+        return self.index.list_dir(path_from_assets, suffix)
+
+    def _check_exists(self, path_from_assets):
+        """Raises FileNotFoundError for a missing asset, logging it only the first time."""
+        if path_from_assets in self._missing:
+            raise FileNotFoundError(f"Asset not found at: {self.assets_path / path_from_assets}")
+        if not self.exists(path_from_assets):
+            self._missing.add(path_from_assets)
+            logger.warning("Asset not found: %s", self.assets_path / path_from_assets)
+            raise FileNotFoundError(f"Asset not found at: {self.assets_path / path_from_assets}")
 
     def load_image(self, path_from_assets, scale=None):
         cache_key = (path_from_assets, scale) 
 
-        if cache_key in self._image_cache:
-            return self._image_cache[cache_key]
+        image = self.image_cache.get(cache_key)
+        if image is not None:
+            return image
         
+        self._check_exists(path_from_assets)
         full_path = self.assets_path / path_from_assets
-        
-        # --- DEBUGGING PRINT STATEMENT ---
-        # This will show us the exact path it's trying to find.
-        print(f"Attempting to load: {full_path}")
-        
-        if not full_path.exists():
-            # This will print a clear error if the path above is wrong.
-            print(f"---!!! FAILED TO FIND FILE AT: {full_path}")
-            raise FileNotFoundError(f"Asset not found at: {full_path}")
-            
+        logger.debug("Loading image %s at scale %s", full_path, scale)
+
         try:
-            image = pygame.image.load(str(full_path)).convert_alpha()
-            
-            if scale is not None:
-                if isinstance(scale, tuple) and len(scale) == 2:
-                    image = pygame.transform.smoothscale(image, scale)
-                elif isinstance(scale, (int, float)):
-                    new_width = int(image.get_width() * scale)
-                    new_height = int(image.get_height() * scale)
-                    image = pygame.transform.smoothscale(image, (new_width, new_height))
-
-            self._image_cache[cache_key] = image
+            # Same steps as a preload, so both give identical pixels.
+            image = _decode(full_path, scale, self.disk_cache).convert_alpha()
+            self.image_cache.put(cache_key, image)
             return image
-        except pygame.error as e:
-            print(f"Error loading image: {full_path}")
-            raise e
+        except pygame.error:
+            logger.error("Error loading image: %s", full_path)
+            raise
+
+    def load_sheet(self, index_path_from_assets):
+        """
+        Loads a packed sprite sheet described by a JSON index and returns a dict
+        mapping each frame's name to a subsurface of the sheet. The whole sheet
+        costs one decode and one convert_alpha; frames share its pixels.
+        """
+        if index_path_from_assets in self._sheet_cache:
+            return self._sheet_cache[index_path_from_assets]
+
+        self._check_exists(index_path_from_assets)
+        with open(self.assets_path / index_path_from_assets, "r") as f:
+            index = json.load(f)
+
+        image_path = Path(index_path_from_assets).parent / index["image"]
+        # The frames below keep the sheet alive, so keep counting it as cached.
+        self.image_cache.pin((image_path.as_posix(), None))
+        sheet = self.load_image(image_path.as_posix())
+        frames = {name: sheet.subsurface(pygame.Rect(rect)) for name, rect in index["frames"].items()}
+
+        self._sheet_cache[index_path_from_assets] = frames
+        return frames
+
+    def _sheet_image_path(self, index_path_from_assets):
+        """The image a sprite sheet index points at, or None if there is no index."""
+        if index_path_from_assets not in self._sheet_images:
+            image_path = None
+            if self.exists(index_path_from_assets):
+                with open(self.assets_path / index_path_from_assets, "r") as f:
+                    image_path = (Path(index_path_from_assets).parent / json.load(f)["image"]).as_posix()
+            self._sheet_images[index_path_from_assets] = image_path
+        return self._sheet_images[index_path_from_assets]
+
+    def _manifest_entries(self, manifest):
+        """
+        Turns a manifest into the image cache keys it needs. Entries are asset
+        paths, (path, scale) pairs, or sprite sheet indexes (*.json), which
+        stand for their sheet image.
+        """
+        entries = []
+        for entry in manifest:
+            path, scale = entry if isinstance(entry, tuple) else (entry, None)
+            if path.endswith(".json"):
+                path = self._sheet_image_path(path)
+                if path is None:
+                    continue
+            key = (path, scale)
+            if key not in entries:
+                entries.append(key)
+        return entries
+
+    def is_loaded(self, manifest):
+        """True if every image in the manifest is already cached; missing files don't count, as in preload."""
+        return all(key in self.image_cache for key in self._manifest_entries(manifest) if self.exists(key[0]))
+
+    def pin(self, manifest):
+        """Keeps the manifest's images from being evicted until unpin(manifest)."""
+        for key in self._manifest_entries(manifest):
+            self.image_cache.pin(key)
+
+    def unpin(self, manifest):
+        for key in self._manifest_entries(manifest):
+            self.image_cache.unpin(key)
+
+    def preload(self, manifest):
+        """
+        Starts decoding the manifest's images on the loader threads and
+        returns a PreloadJob. Images that are cached or missing are skipped.
+        """
+        entries = [key for key in self._manifest_entries(manifest)
+                   if key not in self.image_cache and self.exists(key[0])]
+        return PreloadJob(self, entries)
 
 # Create a single, global instance
 resources = ResourceManager()
\ No newline at end of file
@@ -0,0 +1,290 @@
+# game/core/save_format.py
+"""
+The compact binary save format, and migration of older (JSON) saves.
+
+A save holds a household: a list of cats plus a JSON blob of extra data.
+In memory each cat is the same dict Cat.to_dict() produces.
+
+Binary layout (little-endian):
+    header      magic, version, cat count, offsets of the string table,
+                the cat index and the extra blob, extra blob length
+    strings     count, then (u16 length, UTF-8 bytes) per string; cat ids,
+                names, body types and accessory slots/items are interned here
+    cat index   (offset, length) per cat, so cats decode one at a time
+    cats        fixed-size record (see _CAT), accessory pairs, extra JSON
+    extra       JSON for household-wide data
+"""
+
+import json
+import struct
+
+MAGIC = b"CATF"
+VERSION = 1
+
+# magic, version, cat count, strings offset, index offset, extra offset, extra length
+_HEADER = struct.Struct("<4sHIIIII")
+_STRING_LENGTH = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+_INDEX_ENTRY = struct.Struct("<II")
+# cat id, name, body type (string ids); hunger, happiness, energy (float32);
+# flags; base, pattern, eye, nose colors (RGB); accessory count; extra length
+_CAT = struct.Struct("<HHHfffB12BBH")
+_ACCESSORY = struct.Struct("<HH")
+
+_SLEEPING = 0x01
+_COLOR_KEYS = ("base_color", "pattern_color", "eye_color", "nose_color")
+# Flag bit saying a color is set, per entry of _COLOR_KEYS
+_COLOR_BITS = (0x02, 0x04, 0x08, 0x10)
+
+# Keys stored in the fixed record; anything else goes to the cat's extra JSON
+_CAT_KEYS = {"cat_id", "name", "hunger", "happiness", "energy", "accessories", "customization", "is_sleeping"}
+_CUSTOMIZATION_KEYS = {"body_type"} | set(_COLOR_KEYS)
+# Stats that old saves also copied into "customization"
+_STAT_KEYS = ("hunger", "happiness", "energy")
+
+class SaveFormatError(ValueError):
+    """Raised for data that isn't a save this version can read."""
+
+def is_binary(buffer):
+    return bytes(buffer[:len(MAGIC)]) == MAGIC
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+
+    def intern(self, text):
+        if text not in self._ids:
+            self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return self._ids[text]
+
+    def encode(self):
+        parts = [_COUNT.pack(len(self.strings))]
+        for text in self.strings:
+            data = text.encode("utf-8")
+            parts.append(_STRING_LENGTH.pack(len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+def _encode_cat(cat, strings):
+    customization = cat.get("customization", {})
+    flags = _SLEEPING if cat.get("is_sleeping") else 0
+    colors = []
+    for key, bit in zip(_COLOR_KEYS, _COLOR_BITS):
+        color = customization.get(key)
+        if color is not None:
+            flags |= bit
+            colors.extend(color)
+        else:
+            colors.extend((0, 0, 0))
+
+    extra = {key: value for key, value in cat.items() if key not in _CAT_KEYS}
+    extra_customization = {key: value for key, value in customization.items() if key not in _CUSTOMIZATION_KEYS}
+    if extra_customization:
+        extra["customization"] = extra_customization
+    extra_data = json.dumps(extra, separators=(",", ":")).encode("utf-8") if extra else b""
+
+    accessories = cat.get("accessories", {})
+    parts = [_CAT.pack(
+        strings.intern(cat.get("cat_id", "custom_cat")),
+        strings.intern(cat.get("name", "kitty")),
+        strings.intern(customization.get("body_type", "shorthair")),
+        cat.get("hunger", 80.0), cat.get("happiness", 60.0), cat.get("energy", 100.0),
+        flags, *colors, len(accessories), len(extra_data),
+    )]
+    for slot, item in accessories.items():
+        parts.append(_ACCESSORY.pack(strings.intern(slot), strings.intern(item)))
+    parts.append(extra_data)
+    return b"".join(parts)
+
+def encode(cats, extra=None):
+    """Packs a list of cat dicts (and optional household data) into bytes."""
+    strings = _StringTable()
+    records = [_encode_cat(cat, strings) for cat in cats]
+    string_data = strings.encode()
+    extra_data = json.dumps(extra, separators=(",", ":")).encode("utf-8") if extra else b""
+
+    strings_offset = _HEADER.size
+    index_offset = strings_offset + len(string_data)
+    offset = index_offset + _INDEX_ENTRY.size * len(records)
+    index = []
+    for record in records:
+        index.append(_INDEX_ENTRY.pack(offset, len(record)))
+        offset += len(record)
+
+    header = _HEADER.pack(MAGIC, VERSION, len(records), strings_offset, index_offset, offset, len(extra_data))
+    return b"".join([header, string_data, *index, *records, extra_data])
+
+class SaveFile:
+    """
+    A parsed binary save. The header and string table are read up front;
+    each cat is decoded the first time it is asked for, and cat ids and
+    names can be read without decoding the cat at all.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer)
+        try:
+            magic, version, count, strings_offset, index_offset, extra_offset, extra_length = _HEADER.unpack_from(self._buffer)
+        except struct.error as e:
+            raise SaveFormatError(f"Save is truncated: {e}") from None
+        if magic != MAGIC:
+            raise SaveFormatError("Not a binary save")
+        if version > VERSION:
+            raise SaveFormatError(f"Save version {version} is newer than this game ({VERSION})")
+        self.version = version
+        self._count = count
+        self._index_offset = index_offset
+        self._extra = (extra_offset, extra_length)
+        self.strings = self._read_strings(strings_offset)
+        self._cats = {}
+
+    def _read_strings(self, offset):
+        (count,) = _COUNT.unpack_from(self._buffer, offset)
+        offset += _COUNT.size
+        strings = []
+        for _ in range(count):
+            (length,) = _STRING_LENGTH.unpack_from(self._buffer, offset)
+            offset += _STRING_LENGTH.size
+            strings.append(bytes(self._buffer[offset:offset + length]).decode("utf-8"))
+            offset += length
+        return strings
+
+    def __len__(self):
+        return self._count
+
+    def cat(self, i):
+        """Returns cat i as a dict, decoding it on first use."""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        if i not in self._cats:
+            offset, _ = _INDEX_ENTRY.unpack_from(self._buffer, self._index_offset + i * _INDEX_ENTRY.size)
+            self._cats[i] = self._decode_cat(offset)
+        return self._cats[i]
+
+    def _record(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        offset, _ = _INDEX_ENTRY.unpack_from(self._buffer, self._index_offset + i * _INDEX_ENTRY.size)
+        return _CAT.unpack_from(self._buffer, offset)
+
+    def cat_id(self, i):
+        """Cat i's id, read without decoding the rest of the cat."""
+        return self.strings[self._record(i)[0]]
+
+    def cat_name(self, i):
+        """Cat i's name, read without decoding the rest of the cat."""
+        return self.strings[self._record(i)[1]]
+
+    def cats(self):
+        return [self.cat(i) for i in range(self._count)]
+
+    def _decode_cat(self, offset):
+        fields = _CAT.unpack_from(self._buffer, offset)
+        cat_id, name, body_type, hunger, happiness, energy, flags = fields[:7]
+        colors = fields[7:19]
+        accessory_count, extra_length = fields[19:]
+        offset += _CAT.size
+
+        customization = {"body_type": self.strings[body_type]}
+        for n, (key, bit) in enumerate(zip(_COLOR_KEYS, _COLOR_BITS)):
+            customization[key] = list(colors[n * 3:n * 3 + 3]) if flags & bit else None
+
+        accessories = {}
+        for _ in range(accessory_count):
+            slot, item = _ACCESSORY.unpack_from(self._buffer, offset)
+            accessories[self.strings[slot]] = self.strings[item]
+            offset += _ACCESSORY.size
+
+        cat = {
+            "cat_id": self.strings[cat_id],
+            "name": self.strings[name],
+            "hunger": hunger,
+            "happiness": happiness,
+            "energy": energy,
+            "accessories": accessories,
+            "customization": customization,
+            "is_sleeping": bool(flags & _SLEEPING),
+        }
+        if extra_length:
+            extra = json.loads(bytes(self._buffer[offset:offset + extra_length]))
+            customization.update(extra.pop("customization", {}))
+            cat.update(extra)
+        return cat
+
+    @property
+    def extra(self):
+        """Household-wide data stored alongside the cats."""
+        offset, length = self._extra
+        return json.loads(bytes(self._buffer[offset:offset + length])) if length else {}
+
+class JsonSave:
+    """A migrated JSON save, with the same interface as SaveFile."""
+
+    def __init__(self, household):
+        self.version = household["version"]
+        self._cats = household["cats"]
+        self.extra = household.get("extra", {})
+
+    def __len__(self):
+        return len(self._cats)
+
+    def cat(self, i):
+        return self._cats[i]
+
+    def cat_id(self, i):
+        return self._cats[i].get("cat_id", "custom_cat")
+
+    def cat_name(self, i):
+        return self._cats[i].get("name", "kitty")
+
+    def cats(self):
+        return list(self._cats)
+
+def _migrate_v0(data):
+    """Version 0: the old JSON save, one cat dict with stats repeated in customization."""
+    cat = dict(data)
+    customization = {key: value for key, value in cat.get("customization", {}).items() if key not in _STAT_KEYS}
+    cat["customization"] = customization
+    return {"version": 1, "cats": [cat], "extra": {}}
+
+# Upgrades a JSON save from version N to N + 1
+_MIGRATIONS = {0: _migrate_v0}
+
+def migrate(data):
+    """Brings a JSON save of any version up to the current household layout."""
+    if not isinstance(data, dict):
+        raise SaveFormatError(f"Save is a JSON {type(data).__name__}, not an object")
+    version = data.get("version", 0)
+    if not isinstance(version, int):
+        raise SaveFormatError(f"Save version {version!r} is not a number")
+    if version > VERSION:
+        raise SaveFormatError(f"Save version {version} is newer than this game ({VERSION})")
+    while version < VERSION:
+        data = _MIGRATIONS[version](data)
+        version = data["version"]
+    cats = data.get("cats")
+    if not isinstance(cats, list) or not all(isinstance(cat, dict) for cat in cats):
+        raise SaveFormatError("Save has no list of cats")
+    return data
+
+def decode(buffer):
+    """
+    Reads a save in any supported format, returning a SaveFile or a
+    JsonSave (migrated to the current layout).
+    """
+    if is_binary(buffer):
+        try:
+            return SaveFile(buffer)
+        except struct.error as e:
+            raise SaveFormatError(f"Save is truncated: {e}") from None
+    try:
+        data = json.loads(bytes(buffer))
+    except ValueError as e:
+        raise SaveFormatError(f"Save is neither binary nor JSON: {e}") from None
+    return JsonSave(migrate(data))
+
+def encode_json(cats, extra=None):
+    """The readable alternative to encode(), with the same household layout."""
+    return json.dumps({"version": VERSION, "cats": cats, "extra": extra or {}}, indent=4).encode("utf-8")
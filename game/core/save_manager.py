@@ -1,35 +1,453 @@
 # game/core/save_manager.py
 
 import json
+import logging
+import os
+import sqlite3
+import threading
+import time
 from pathlib import Path
+from core import save_format, save_store
+from settings import SAVE_BACKEND, SAVE_FORMAT, SAVE_SLOT
 
-# Define the path for our saves directory and the save file
+logger = logging.getLogger(__name__)
+
+# Define the path for our saves directory and the save files
 SAVES_DIR = Path(__file__).parent.parent.parent / "saves"
-SAVE_FILE = SAVES_DIR / "savegame.json"
+SAVE_FILE = SAVES_DIR / "savegame.dat"
+JSON_SAVE_FILE = SAVES_DIR / "savegame.json"
+SAVE_DB = SAVES_DIR / "saves.db"
 
-def save_game(data):
-    """Saves the given data dictionary to the save file as JSON."""
+def _save_path():
+    """Where saves are written, depending on settings.SAVE_FORMAT."""
+    return JSON_SAVE_FILE if SAVE_FORMAT == "json" else SAVE_FILE
+
+def _encode(cats):
+    if SAVE_FORMAT == "json":
+        return save_format.encode_json(cats)
+    return save_format.encode(cats)
+
+def _write_atomic(path, data):
+    """Writes data to a temp file, fsyncs it and renames it over path."""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    # Make the rename itself durable where the platform allows it.
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+class SaveWorker:
+    """
+    Writes saves on a background thread. Snapshots are keyed (the whole
+    household for file saves, one cat for the database); only the newest
+    snapshot per key waiting to be written is kept, so a burst of saves
+    costs one write, and a snapshot identical to the last one written is
+    skipped.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # key -> (snapshot, function that writes it)
+        self._pending = {}
+        self._writing = False
+        # (key, snapshot) being written right now
+        self._in_flight = None
+        self._last_written = {}
+        self._thread = None
+        self.writes = 0
+        self.skipped = 0
+
+    def submit(self, key, data, write):
+        """
+        Queues data (an already serialized snapshot) to be passed to
+        write() on the worker thread. Returns False if it matched the last save.
+        """
+        with self._condition:
+            if data == self._latest(key):
+                self.skipped += 1
+                return False
+            if key in self._pending:
+                self.skipped += 1
+            self._pending[key] = (data, write)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-worker", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        return True
+
+    def _latest(self, key):
+        if key in self._pending:
+            return self._pending[key][0]
+        if self._in_flight is not None and self._in_flight[0] == key:
+            return self._in_flight[1]
+        return self._last_written.get(key)
+
+    def latest(self, key):
+        """The newest snapshot for key saved or waiting to be saved, or None."""
+        with self._condition:
+            return self._latest(key)
+
+    def flush(self, timeout=None):
+        """Waits until every queued save is written. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                key = next(iter(self._pending))
+                data, write = self._pending.pop(key)
+                self._writing = True
+                self._in_flight = (key, data)
+            written = False
+            try:
+                write(data)
+                self.writes += 1
+                written = True
+            except (OSError, sqlite3.Error) as e:
+                logger.error("Error saving game: %s", e)
+            except Exception:
+                # A bad snapshot must not stop the worker; flush() would wait forever.
+                logger.exception("Unexpected error saving game")
+            finally:
+                with self._condition:
+                    if written:
+                        self._last_written[key] = data
+                    self._writing = False
+                    self._in_flight = None
+                    self._condition.notify_all()
+
+class SaveInfo:
+    """What the menu needs to know about a save, read without loading any cat."""
+
+    def __init__(self, cat_ids, names, last_played):
+        self.cat_ids = cat_ids
+        self.names = names
+        # Unix time of the last save
+        self.last_played = last_played
+
+def _find_save_file():
+    """The save file to read, or None. The configured format wins if both exist."""
+    paths = [_save_path()] + [path for path in (SAVE_FILE, JSON_SAVE_FILE) if path != _save_path()]
+    return next((path for path in paths if path.is_file()), None)
+
+def _read_save_file(path):
+    """The save at path as a SaveFile or JsonSave, or None if it can't be read."""
     try:
-        # Ensure the 'saves' directory exists
+        save = save_format.decode(path.read_bytes())
+    except OSError as e:
+        logger.error("Error loading game: %s", e)
+        return None
+    except (save_format.SaveFormatError, KeyError, IndexError, UnicodeDecodeError) as e:
+        logger.error("Error loading game from %s: %s", path, e)
+        return None
+    logger.info("Game loaded successfully from %s", path)
+    return save
+
+def _cat_id(cat):
+    return cat.get("cat_id", "custom_cat")
+
+class FileBackend:
+    """
+    The whole household in one save file (settings.SAVE_FORMAT). The parsed
+    save is kept until the file changes, so the menu, the loading screen and
+    the home scene all share one read.
+    """
+
+    _KEY = "household"
+
+    def __init__(self, worker):
+        self._worker = worker
+        self._cats = None
+        # What the cached save was read from: the pending bytes, or (path, mtime, size)
+        self._source = None
+        self._save = None
+        self._last_played = None
+        self._saved_at = None
+
+    def save_cat(self, cat, replace=False):
+        if replace:
+            self._cats = []
+        elif self._cats is None:
+            save = self.open()
+            self._cats = save.cats() if save else []
+        for i, other in enumerate(self._cats):
+            if _cat_id(other) == _cat_id(cat):
+                self._cats[i] = cat
+                break
+        else:
+            self._cats.append(cat)
+        # Serialize now: the caller may keep changing the data after we return.
+        if not self._worker.submit(self._KEY, _encode(self._cats), self._write):
+            return False
+        self._saved_at = time.time()
+        return True
+
+    def _write(self, data):
         SAVES_DIR.mkdir(exist_ok=True)
-        
-        with open(SAVE_FILE, "w") as f:
-            json.dump(data, f, indent=4)
-        print(f"Game saved successfully to {SAVE_FILE}")
-    except Exception as e:
-        print(f"Error saving game: {e}")
+        _write_atomic(_save_path(), data)
+        logger.info("Game saved successfully to %s", _save_path())
 
-def load_game():
-    """Loads and returns data from the save file. Returns None if no save exists."""
-    if not SAVE_FILE.is_file():
-        print("No save file found.")
+    def open(self):
+        # A save from this session (queued or written) is newer than the file.
+        data = self._worker.latest(self._KEY)
+        if data is not None:
+            if data != self._source:
+                # Written before close() if this backend didn't queue it; then the file has the time.
+                saved_at = self._saved_at if self._saved_at is not None else _save_path().stat().st_mtime
+                self._source, self._save, self._last_played = data, save_format.decode(data), saved_at
+            return self._save
+
+        path = _find_save_file()
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        source = (path, stat.st_mtime_ns, stat.st_size)
+        if source != self._source:
+            self._source, self._save, self._last_played = source, _read_save_file(path), stat.st_mtime
+        return self._save
+
+    def probe(self):
+        save = self.open()
+        if save is None or len(save) == 0:
+            return None
+        return SaveInfo([save.cat_id(i) for i in range(len(save))],
+                        [save.cat_name(i) for i in range(len(save))], self._last_played)
+
+    def saved_at(self, cat_id):
+        # The file is written whole, so every cat was saved when it was.
+        save = self.open()
+        if save is None or not any(save.cat_id(i) == cat_id for i in range(len(save))):
+            return None
+        return self._last_played
+
+    def load_cat(self, cat_id=None):
+        save = self.open()
+        if save is None:
+            return None
+        for i in range(len(save)):
+            if cat_id is None or save.cat_id(i) == cat_id:
+                return save.cat(i)
         return None
-    
-    try:
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
-        print(f"Game loaded successfully from {SAVE_FILE}")
-        return data
-    except Exception as e:
-        print(f"Error loading game: {e}")
-        return None
\ No newline at end of file
+
+    def cats_with_hunger_below(self, threshold):
+        save = self.open()
+        cats = save.cats() if save else []
+        hungry = [(_cat_id(cat), cat.get("name", "kitty"), cat["hunger"]) for cat in cats if cat.get("hunger", 80.0) < threshold]
+        return sorted(hungry, key=lambda entry: entry[2])
+
+    def close(self):
+        pass
+
+class _SlotSave:
+    """A database slot with the same interface as save_format.SaveFile."""
+
+    version = save_store.SCHEMA_VERSION
+    extra = {}
+
+    def __init__(self, cat_ids, load_cat):
+        self._cat_ids = cat_ids
+        self._load_cat = load_cat
+
+    def __len__(self):
+        return len(self._cat_ids)
+
+    def cat_id(self, i):
+        return self._cat_ids[i]
+
+    def cat_name(self, i):
+        return self.cat(i).get("name", "kitty")
+
+    def cat(self, i):
+        return self._load_cat(self._cat_ids[i])
+
+    def cats(self):
+        return [self.cat(i) for i in range(len(self))]
+
+class SqliteBackend:
+    """
+    One database row per cat in saves/saves.db (see core.save_store), so a
+    save only rewrites the cat that changed and one cat loads on its own.
+    An existing save file is imported the first time the database is opened.
+    """
+
+    def __init__(self, worker):
+        self._worker = worker
+        self._store = None
+        # (slot, cat_id) -> when this session last queued a changed save
+        self._saved_at = {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = save_store.SaveStore(SAVE_DB)
+            path = _find_save_file()
+            if path is not None and not self._store.cat_ids(SAVE_SLOT):
+                save = _read_save_file(path)
+                if save is not None and len(save):
+                    self._store.save_household(save.cats(), SAVE_SLOT)
+                    logger.info("Imported %d cat(s) from the save file into %s", len(save), SAVE_DB)
+        return self._store
+
+    def save_cat(self, cat, replace=False):
+        store = self.store
+        data = json.dumps(cat, sort_keys=True)
+        def write(data):
+            if replace:
+                store.replace_household([json.loads(data)], SAVE_SLOT)
+            else:
+                store.save_cat(json.loads(data), SAVE_SLOT)
+            logger.info("Game saved successfully to %s (slot %d)", SAVE_DB, SAVE_SLOT)
+        key = (SAVE_SLOT, _cat_id(cat))
+        if not self._worker.submit(key, data, write):
+            return False
+        self._saved_at[key] = time.time()
+        return True
+
+    def open(self):
+        cat_ids = self.store.cat_ids(SAVE_SLOT)
+        if not cat_ids:
+            # The very first save may still be on its way to the database.
+            self._worker.flush()
+            cat_ids = self.store.cat_ids(SAVE_SLOT)
+        return _SlotSave(cat_ids, self.load_cat) if cat_ids else None
+
+    def probe(self):
+        summary = self.store.summary(SAVE_SLOT)
+        if not summary:
+            self._worker.flush()
+            summary = self.store.summary(SAVE_SLOT)
+        if not summary:
+            return None
+        cat_ids, names, saved_at = zip(*summary)
+        return SaveInfo(list(cat_ids), list(names), max(saved_at))
+
+    def load_cat(self, cat_id=None):
+        if cat_id is None:
+            save = self.open()
+            if save is None:
+                return None
+            cat_id = save.cat_id(0)
+        # A save that is still queued is newer than the database.
+        data = self._worker.latest((SAVE_SLOT, cat_id))
+        if data is not None:
+            return json.loads(data)
+        return self.store.load_cat(cat_id, SAVE_SLOT)
+
+    def saved_at(self, cat_id):
+        saved_at = self._saved_at.get((SAVE_SLOT, cat_id))
+        return saved_at if saved_at is not None else self.store.saved_at(cat_id, SAVE_SLOT)
+
+    def cats_with_hunger_below(self, threshold):
+        self._worker.flush()
+        return self.store.cats_with_hunger_below(threshold, SAVE_SLOT)
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+_BACKENDS = {"file": FileBackend, "sqlite": SqliteBackend}
+
+_worker = SaveWorker()
+_backend = None
+
+def _get_backend():
+    global _backend
+    if _backend is None:
+        if SAVE_BACKEND not in _BACKENDS:
+            raise ValueError(f"Unknown SAVE_BACKEND {SAVE_BACKEND!r}; expected one of {', '.join(_BACKENDS)}")
+        _backend = _BACKENDS[SAVE_BACKEND](_worker)
+    return _backend
+
+def save_game(data):
+    """
+    Saves the given cat dictionary in the background, replacing the saved
+    cat with the same cat_id. Returns at once; call flush() to wait for the
+    write (e.g. before quitting).
+    """
+    return _get_backend().save_cat(data)
+
+def new_game(data):
+    """Like save_game, but data becomes the only saved cat: a new game replaces the household."""
+    return _get_backend().save_cat(data, replace=True)
+
+def flush(timeout=None):
+    """Blocks until all saves handed to save_game are written."""
+    return _worker.flush(timeout)
+
+def close():
+    """Writes any queued saves and closes the save backend."""
+    global _backend
+    _worker.flush()
+    if _backend is not None:
+        _backend.close()
+        _backend = None
+
+def open_save():
+    """
+    Returns the current household, whose cats are read on demand (len(),
+    cat(i), cat_id(i), cats()), or None if there is no readable save.
+    """
+    save = _get_backend().open()
+    if save is None:
+        logger.info("No save file found.")
+    return save
+
+def probe():
+    """
+    A SaveInfo (cat ids, names, last played) for the current save, or None
+    if there isn't one. Cheap: cats aren't decoded, and the parsed save is
+    kept for the load_cat() that usually follows.
+    """
+    return _get_backend().probe()
+
+def load_cat(cat_id=None):
+    """Loads one cat's data by id (the first cat if None). Returns None if it isn't saved."""
+    return _get_backend().load_cat(cat_id)
+
+def saved_at(cat_id=None):
+    """
+    Unix time the cat (the first one if None) was last saved with changes,
+    or None if it isn't saved. Stamped when the save is made, not stored
+    in the cat's data, so identical snapshots stay identical.
+    """
+    if cat_id is None:
+        save = open_save()
+        if save is None or len(save) == 0:
+            return None
+        cat_id = save.cat_id(0)
+    return _get_backend().saved_at(cat_id)
+
+def load_cat_with_time(cat_id=None):
+    """
+    (cat data, saved_at) for a saved cat, as load_cat() and saved_at()
+    give them, or (None, None) if it isn't saved.
+    """
+    cat = load_cat(cat_id)
+    if cat is None:
+        return None, None
+    return cat, saved_at(_cat_id(cat))
+
+def load_game():
+    """Loads and returns the first cat's data. Returns None if no save exists."""
+    return load_cat()
+
+def cats_with_hunger_below(threshold):
+    """(cat_id, name, hunger) for every saved cat hungrier than threshold, hungriest first."""
+    return _get_backend().cats_with_hunger_below(threshold)
@@ -0,0 +1,271 @@
+# game/core/save_store.py
+
+import json
+import sqlite3
+import threading
+import time
+from settings import STAT_HISTORY_LIMIT
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cats (
+    slot INTEGER NOT NULL,
+    cat_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body_type TEXT NOT NULL,
+    base_color INTEGER,
+    pattern_color INTEGER,
+    eye_color INTEGER,
+    nose_color INTEGER,
+    hunger REAL NOT NULL,
+    happiness REAL NOT NULL,
+    energy REAL NOT NULL,
+    is_sleeping INTEGER NOT NULL,
+    extra TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (slot, cat_id)
+);
+CREATE INDEX IF NOT EXISTS cats_by_hunger ON cats (slot, hunger);
+
+CREATE TABLE IF NOT EXISTS accessories (
+    slot INTEGER NOT NULL,
+    cat_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (slot, cat_id, category),
+    FOREIGN KEY (slot, cat_id) REFERENCES cats (slot, cat_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS stat_snapshots (
+    id INTEGER PRIMARY KEY,
+    slot INTEGER NOT NULL,
+    cat_id TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    hunger REAL NOT NULL,
+    happiness REAL NOT NULL,
+    energy REAL NOT NULL,
+    FOREIGN KEY (slot, cat_id) REFERENCES cats (slot, cat_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_cat ON stat_snapshots (slot, cat_id, taken_at);
+"""
+
+_COLOR_KEYS = ("base_color", "pattern_color", "eye_color", "nose_color")
+# Cat columns after (slot, cat_id), in table order, up to (not including) updated_at
+_COLUMNS = ("name", "body_type") + _COLOR_KEYS + ("hunger", "happiness", "energy", "is_sleeping", "extra")
+_CAT_KEYS = {"cat_id", "name", "hunger", "happiness", "energy", "accessories", "customization", "is_sleeping"}
+_CUSTOMIZATION_KEYS = {"body_type"} | set(_COLOR_KEYS)
+
+def _pack_color(color):
+    return None if color is None else (color[0] << 16) | (color[1] << 8) | color[2]
+
+def _unpack_color(value):
+    return None if value is None else [(value >> 16) & 255, (value >> 8) & 255, value & 255]
+
+def _cat_row(cat):
+    """The cats-table values for a cat dict, in _COLUMNS order."""
+    customization = cat.get("customization", {})
+    extra = {key: value for key, value in cat.items() if key not in _CAT_KEYS}
+    extra_customization = {key: value for key, value in customization.items() if key not in _CUSTOMIZATION_KEYS}
+    if extra_customization:
+        extra["customization"] = extra_customization
+    return (
+        cat.get("name", "kitty"),
+        customization.get("body_type", "shorthair"),
+        *(_pack_color(customization.get(key)) for key in _COLOR_KEYS),
+        cat.get("hunger", 80.0),
+        cat.get("happiness", 60.0),
+        cat.get("energy", 100.0),
+        int(bool(cat.get("is_sleeping"))),
+        json.dumps(extra, sort_keys=True) if extra else None,
+    )
+
+class SaveStore:
+    """
+    Saves in an SQLite database: one row per cat, one per equipped
+    accessory, and a stat snapshot whenever a cat's stats are saved.
+    Slots are independent households. Saving compares against what was
+    last written and only touches rows that changed; each cat keeps its
+    newest history_limit stat snapshots. Safe to use from the save worker
+    thread and the main thread.
+    """
+
+    def __init__(self, path, history_limit=STAT_HISTORY_LIMIT):
+        self.path = path
+        self.history_limit = history_limit
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        # (slot, cat_id) -> (cat row, accessories) as last written or read
+        self._written = {}
+        self.rows_written = 0
+
+        with self._lock, self._connection as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(f"Save database version {version} is newer than this game ({SCHEMA_VERSION})")
+            db.executescript(_SCHEMA)
+            db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _stored(self, db, slot, cat_id):
+        """What the database holds for a cat, from memory when we can."""
+        key = (slot, cat_id)
+        if key not in self._written:
+            row = db.execute(f"SELECT {', '.join(_COLUMNS)} FROM cats WHERE slot = ? AND cat_id = ?", key).fetchone()
+            accessories = dict(db.execute("SELECT category, item FROM accessories WHERE slot = ? AND cat_id = ?", key))
+            self._written[key] = (row, accessories)
+        return self._written[key]
+
+    def _save_cat(self, db, cat, slot, now):
+        cat_id = cat.get("cat_id", "custom_cat")
+        row = _cat_row(cat)
+        accessories = dict(cat.get("accessories", {}))
+        old_row, old_accessories = self._stored(db, slot, cat_id)
+
+        if row != old_row:
+            placeholders = ", ".join("?" * (len(_COLUMNS) + 3))
+            updates = ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS + ("updated_at",))
+            db.execute(f"INSERT INTO cats (slot, cat_id, {', '.join(_COLUMNS)}, updated_at) VALUES ({placeholders}) "
+                       f"ON CONFLICT (slot, cat_id) DO UPDATE SET {updates}", (slot, cat_id, *row, now))
+            self.rows_written += 1
+            stats = row[_COLUMNS.index("hunger"):_COLUMNS.index("energy") + 1]
+            if old_row is None or stats != old_row[_COLUMNS.index("hunger"):_COLUMNS.index("energy") + 1]:
+                db.execute("INSERT INTO stat_snapshots (slot, cat_id, taken_at, hunger, happiness, energy) VALUES (?, ?, ?, ?, ?, ?)",
+                           (slot, cat_id, now, *stats))
+                self.rows_written += 1
+                # Stats change every tick, so a game left running adds one per autosave.
+                pruned = db.execute("DELETE FROM stat_snapshots WHERE slot = ? AND cat_id = ? AND id NOT IN "
+                                    "(SELECT id FROM stat_snapshots WHERE slot = ? AND cat_id = ? ORDER BY taken_at DESC, id DESC LIMIT ?)",
+                                    (slot, cat_id, slot, cat_id, self.history_limit))
+                self.rows_written += pruned.rowcount
+
+        for category in old_accessories.keys() - accessories.keys():
+            db.execute("DELETE FROM accessories WHERE slot = ? AND cat_id = ? AND category = ?", (slot, cat_id, category))
+            self.rows_written += 1
+        for category, item in accessories.items():
+            if old_accessories.get(category) != item:
+                db.execute("INSERT INTO accessories (slot, cat_id, category, item) VALUES (?, ?, ?, ?) "
+                           "ON CONFLICT (slot, cat_id, category) DO UPDATE SET item = excluded.item",
+                           (slot, cat_id, category, item))
+                self.rows_written += 1
+
+        self._written[(slot, cat_id)] = (row, accessories)
+
+    def save_cat(self, cat, slot=0):
+        """Saves one cat dict (as made by Cat.to_dict) into a slot."""
+        with self._lock:
+            try:
+                with self._connection as db:
+                    self._save_cat(db, cat, slot, time.time())
+            except sqlite3.Error:
+                # The transaction rolled back; re-read the rows next time.
+                self._written.pop((slot, cat.get("cat_id", "custom_cat")), None)
+                raise
+
+    def save_household(self, cats, slot=0):
+        """Saves several cats in one transaction."""
+        with self._lock:
+            try:
+                with self._connection as db:
+                    now = time.time()
+                    for cat in cats:
+                        self._save_cat(db, cat, slot, now)
+            except sqlite3.Error:
+                self._written.clear()
+                raise
+
+    def replace_household(self, cats, slot=0):
+        """Makes cats the only cats in a slot, in one transaction; the others' rows are deleted."""
+        cat_ids = {cat.get("cat_id", "custom_cat") for cat in cats}
+        with self._lock:
+            try:
+                with self._connection as db:
+                    stale = [row[0] for row in db.execute("SELECT cat_id FROM cats WHERE slot = ?", (slot,))
+                             if row[0] not in cat_ids]
+                    # Their accessories and stat snapshots go with them (ON DELETE CASCADE).
+                    db.executemany("DELETE FROM cats WHERE slot = ? AND cat_id = ?", [(slot, cat_id) for cat_id in stale])
+                    self.rows_written += len(stale)
+                    for cat_id in stale:
+                        self._written.pop((slot, cat_id), None)
+                    now = time.time()
+                    for cat in cats:
+                        self._save_cat(db, cat, slot, now)
+            except sqlite3.Error:
+                self._written.clear()
+                raise
+
+    def load_cat(self, cat_id=None, slot=0):
+        """Loads one cat dict, or the slot's first cat if cat_id is None. None if missing."""
+        with self._lock:
+            db = self._connection
+            if cat_id is None:
+                first = db.execute("SELECT cat_id FROM cats WHERE slot = ? ORDER BY rowid LIMIT 1", (slot,)).fetchone()
+                if first is None:
+                    return None
+                cat_id = first[0]
+            row, accessories = self._stored(db, slot, cat_id)
+        if row is None:
+            return None
+
+        values = dict(zip(_COLUMNS, row))
+        cat = {
+            "cat_id": cat_id,
+            "name": values["name"],
+            "hunger": values["hunger"],
+            "happiness": values["happiness"],
+            "energy": values["energy"],
+            "accessories": dict(accessories),
+            "customization": {"body_type": values["body_type"],
+                              **{key: _unpack_color(values[key]) for key in _COLOR_KEYS}},
+            "is_sleeping": bool(values["is_sleeping"]),
+        }
+        if values["extra"]:
+            extra = json.loads(values["extra"])
+            cat["customization"].update(extra.pop("customization", {}))
+            cat.update(extra)
+        return cat
+
+    def cat_ids(self, slot=0):
+        """The ids of every cat in a slot, oldest first."""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT cat_id FROM cats WHERE slot = ? ORDER BY rowid", (slot,))]
+
+    def summary(self, slot=0):
+        """(cat_id, name, updated_at) for every cat in a slot, oldest first."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT cat_id, name, updated_at FROM cats WHERE slot = ? ORDER BY rowid", (slot,)).fetchall()
+
+    def saved_at(self, cat_id, slot=0):
+        """Unix time a cat's row last changed, or None if it isn't saved."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated_at FROM cats WHERE slot = ? AND cat_id = ?", (slot, cat_id)).fetchone()
+        return row[0] if row else None
+
+    def cats_with_hunger_below(self, threshold, slot=0):
+        """(cat_id, name, hunger) for hungry cats, hungriest first; uses the hunger index."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT cat_id, name, hunger FROM cats WHERE slot = ? AND hunger < ? ORDER BY hunger",
+                (slot, threshold)).fetchall()
+
+    def stat_history(self, cat_id, slot=0, limit=100):
+        """The newest (taken_at, hunger, happiness, energy) snapshots of a cat, newest first."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT taken_at, hunger, happiness, energy FROM stat_snapshots "
+                "WHERE slot = ? AND cat_id = ? ORDER BY taken_at DESC LIMIT ?",
+                (slot, cat_id, limit)).fetchall()
+
+    def slots(self):
+        """Slots that hold at least one cat."""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT slot FROM cats ORDER BY slot")]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,15 +1,101 @@
 # game/core/scene_manager.py
 
 import pygame
+from core.resource_manager import resources
+from core.timers import TimerService
+
+# Events after which the whole window has to be repainted.
+FULL_REDRAW_EVENTS = (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+class DirtyRegionTracker:
+    """
+    Collects the screen regions that changed since the last frame.
+    Scenes and entities either mark() rects directly or track() an object,
+    which marks both its old and new rect whenever it moves or changes.
+    """
+
+    def __init__(self, full_redraw_ratio=0.5):
+        # Past this share of the screen a single full redraw is cheaper.
+        self.full_redraw_ratio = full_redraw_ratio
+        self._rects = []
+        self._full = True
+        self._tracked = {}
+
+    def mark(self, rect):
+        """Marks a region of the screen as changed."""
+        if rect:
+            self._rects.append(pygame.Rect(rect))
+
+    def mark_full(self):
+        """Marks the whole screen as changed."""
+        self._full = True
+
+    def track(self, key, rect, state=None):
+        """
+        Compares an object's rect and visual state with the previous frame.
+        A rect of None means the object is not drawn at all.
+        """
+        current = (tuple(rect) if rect else None, state)
+        previous = self._tracked.get(key)
+        if previous == current:
+            return
+        if previous and previous[0]:
+            self.mark(previous[0])
+        self.mark(rect)
+        self._tracked[key] = current
+
+    def reset(self):
+        """Forgets all tracked objects and forces a full redraw."""
+        self._tracked.clear()
+        self._rects.clear()
+        self._full = True
+
+    def flush(self, screen_rect):
+        """Returns the merged changed regions and starts a new frame."""
+        rects = [r.clip(screen_rect) for r in self._rects]
+        full = self._full
+        self._rects = []
+        self._full = False
+        if full:
+            return [pygame.Rect(screen_rect)]
+
+        merged = []
+        for rect in rects:
+            if not rect.w or not rect.h:
+                continue
+            # Fold in every already-merged rect this one touches.
+            overlapping = rect.collidelistall(merged)
+            for index in reversed(overlapping):
+                rect.union_ip(merged.pop(index))
+            merged.append(rect)
+
+        area = sum(r.w * r.h for r in merged)
+        if area > screen_rect.w * screen_rect.h * self.full_redraw_ratio:
+            return [pygame.Rect(screen_rect)]
+        return merged
 
 class BaseScene:
     def __init__(self, scene_manager, game):
         self.scene_manager = scene_manager
         self.game = game
+        self.pinned_assets = []
+        # Advanced by SceneManager before each update(); pause it in on_pause.
+        self.timers = TimerService()
+
+    @classmethod
+    def asset_manifest(cls, game, data=None):
+        """
+        Images the scene loads when it is created, as a resources.preload
+        manifest. SceneManager.load_scene preloads them behind a loading screen.
+        """
+        return []
 
     def handle_event(self, event): pass
     def update(self, dt): pass
-    def draw(self, screen): return []
+    def interpolate(self, alpha): pass
+    def is_idle(self): return False # True when nothing animates or counts down; lets the game slow its frame rate
+    def report_dirty(self, dirty): pass
+    def draw(self, screen): pass
     def on_enter(self, data=None): pass
     def on_exit(self): pass
     def on_quit(self): pass
@@ -21,31 +107,59 @@ class SceneManager:
         self.game = game
         self.screen = pygame.display.get_surface()
         self.scenes = []
+        self.dirty = DirtyRegionTracker()
         self.push(initial_scene_class)
 
     def get_active_scene(self):
         return self.scenes[-1] if self.scenes else None
 
     def handle_event(self, event):
+        if event.type in FULL_REDRAW_EVENTS:
+            self.dirty.mark_full()
         if self.get_active_scene():
             self.get_active_scene().handle_event(event)
 
     def update(self, dt):
-        if self.get_active_scene():
-            self.get_active_scene().update(dt)
+        scene = self.get_active_scene()
+        if scene:
+            scene.timers.update(dt)
+            scene.update(dt)
 
-    def draw(self):
-        if self.get_active_scene():
-            # This now correctly returns the dirty rects to the main loop
-            return self.get_active_scene().draw(self.screen)
-        return []
+    def draw(self, alpha=1.0):
+        """
+        Redraws only the regions that changed and returns them for
+        pygame.display.update. Scenes draw their full frame once, clipped
+        to the box around the dirty regions, which limits the pixel work
+        (including restoring the background under moved sprites) without
+        repeating the scene's Python-side drawing per region. alpha is how
+        far the frame is between the last simulation step and the next,
+        for scenes that interpolate moving things.
+        """
+        scene = self.get_active_scene()
+        if not scene:
+            return []
+
+        screen = self.game.screen
+        scene.interpolate(alpha)
+        scene.report_dirty(self.dirty)
+        dirty_rects = self.dirty.flush(screen.get_rect())
+        if dirty_rects:
+            screen.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+            scene.draw(screen)
+            screen.set_clip(None)
+        return dirty_rects
 
     def push(self, scene_class, data=None):
         if self.get_active_scene() and hasattr(self.get_active_scene(), 'on_pause'):
             self.get_active_scene().on_pause()
+        # The scene's images stay cached while it is on the stack.
+        manifest = scene_class.asset_manifest(self.game, data)
+        resources.pin(manifest)
         new_scene = scene_class(self, self.game)
+        new_scene.pinned_assets = manifest
         new_scene.on_enter(data)
         self.scenes.append(new_scene)
+        self.dirty.reset()
         
     def on_resume(self): 
         """Called when this scene becomes active again after another scene pops."""
@@ -57,12 +171,26 @@ class SceneManager:
             popped_scene = self.get_active_scene()
             popped_scene.on_exit()
             self.scenes.pop()
+            resources.unpin(popped_scene.pinned_assets)
             
             # NOW, after the scene has been removed, get the NEW active scene and tell it to resume.
+            self.dirty.reset()
             if self.get_active_scene():
                 self.get_active_scene().on_resume()
 
     def set_scene(self, scene_class, data=None):
         while self.scenes:
             self.pop()
-        self.push(scene_class, data)
\ No newline at end of file
+        self.push(scene_class, data)
+
+    def load_scene(self, scene_class, data=None):
+        """
+        Like set_scene, but if the scene's assets aren't loaded yet, shows a
+        loading screen while they are decoded in the background.
+        """
+        from scenes.loading import LoadingScene
+        manifest = scene_class.asset_manifest(self.game, data)
+        if resources.is_loaded(manifest):
+            self.set_scene(scene_class, data)
+        else:
+            self.set_scene(LoadingScene, data=(scene_class, data, manifest))
\ No newline at end of file
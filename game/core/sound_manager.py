@@ -1,25 +1,109 @@
 # game/core/sound_manager.py
 
+import logging
+import os
+import time
 import pygame
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from core.asset_index import AssetIndex
+from settings import (EFFECT_CHANNELS, SOUND_EFFECT_RULES, DEFAULT_SOUND_EFFECT_RULE,
+                      MUSIC_CROSSFADE, AUDIO_DRIVER)
+
+logger = logging.getLogger(__name__)
 
 class SoundManager:
     def __init__(self):
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        # The mixer is started by _ensure_mixer() the first time a sound is used.
+        self._mixer_ready = None
         self.base_path = Path(__file__).parent.parent.parent
         self.sounds_path = self.base_path / "assets" / "sounds"
         
         self._effects_cache = {}
-        self._music_cache = {}
+        # What's in the sounds folder, listed once; paths we already reported missing.
+        self.index = AssetIndex(self.sounds_path)
+        self._missing = set()
 
         self.music_volume = 0.5 # Default volume
         self.is_muted = False
 
+        # Effects play on a fixed pool of channels; each voice remembers
+        # (path, priority, start time) so we know what we may interrupt.
+        self._channels = []
+        self._voices = [None] * EFFECT_CHANNELS
+        self._last_played = {}
+
+        # Music is decoded into a Sound off the main thread, then crossfaded
+        # between two reserved channels by update(). A decoded track is raw
+        # PCM, about 10 MB a minute, so it is only kept while its channel
+        # plays it: at most two tracks, during a crossfade.
+        self._music_channels = []
+        self._music_sounds = [None, None] # (path, Sound) per music channel
+        self._music_executor = None
+        self._music_loading = None # (path, future, loops)
+        self._music_track = None
+        self._music_active = None # index into _music_channels
+        self._music_fading_out = None
+        self._fade_elapsed = None
+
+        self.played = 0
+        self.stolen = 0
+        self.dropped_cooldown = 0
+        self.dropped_busy = 0
+
+    def _ensure_mixer(self):
+        """
+        Starts the mixer on first use. Returns False, and keeps every sound
+        call a no-op, if there is no audio device to open or disable() was called.
+        """
+        if self._mixer_ready is None:
+            if AUDIO_DRIVER:
+                os.environ.setdefault("SDL_AUDIODRIVER", AUDIO_DRIVER)
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+                pygame.mixer.set_num_channels(2 + EFFECT_CHANNELS)
+                # Channels 0 and 1 are for music; Sound.play() won't pick them.
+                pygame.mixer.set_reserved(2)
+                self._music_channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+                self._channels = [pygame.mixer.Channel(2 + i) for i in range(EFFECT_CHANNELS)]
+                self._mixer_ready = True
+            except pygame.error as e:
+                logger.warning("Audio is unavailable, sounds are disabled: %s", e)
+                self._mixer_ready = False
+        return self._mixer_ready
+
+    def disable(self):
+        """
+        Makes every sound call a no-op from now on, e.g. for headless runs.
+        Stops anything already playing; the mixer is never opened if it wasn't.
+        """
+        if self._mixer_ready:
+            pygame.mixer.stop()
+        # The same state as having no audio device
+        self._mixer_ready = False
+        self._voices = [None] * EFFECT_CHANNELS
+        self._music_track = None
+        self._music_loading = None
+        self._music_sounds = [None, None]
+        self._music_active = None
+        self._music_fading_out = None
+        self._fade_elapsed = None
+
+    def _apply_music_volume(self):
+        """Sets both music channels' volumes from the volume, mute and crossfade state."""
+        volume = 0.0 if self.is_muted else self.music_volume
+        t = 1.0 if self._fade_elapsed is None else min(1.0, self._fade_elapsed / MUSIC_CROSSFADE)
+        if self._music_active is not None:
+            self._music_channels[self._music_active].set_volume(volume * t)
+        if self._music_fading_out is not None:
+            self._music_channels[self._music_fading_out].set_volume(volume * (1.0 - t))
+
     def set_music_volume(self, volume):
         """Sets the music volume, clamping between 0.0 and 1.0."""
         self.music_volume = max(0.0, min(1.0, volume))
-        if not self.is_muted:
-            pygame.mixer.music.set_volume(self.music_volume)
+        if self._mixer_ready:
+            self._apply_music_volume()
 
     def increase_volume(self, amount=0.1):
         """Increases music volume."""
@@ -32,55 +116,206 @@ class SoundManager:
     def toggle_mute(self):
         """Toggles music mute on and off."""
         self.is_muted = not self.is_muted
-        if self.is_muted:
-            pygame.mixer.music.set_volume(0.0)
-        else:
-            pygame.mixer.music.set_volume(self.music_volume)
+        if self._mixer_ready:
+            self._apply_music_volume()
+
+    def refresh_index(self):
+        """Rescans the sounds folder, e.g. after adding files."""
+        self.index = AssetIndex(self.sounds_path)
+        self.index.refresh()
+        self._missing.clear()
+
+    def _find(self, path_from_sounds, kind):
+        """Returns the full path of a sound file, or None (logged once) if it's missing."""
+        if path_from_sounds in self._missing:
+            return None
+        if self.index.root != self.sounds_path:
+            self.refresh_index()
+        if not self.index.exists(path_from_sounds):
+            self._missing.add(path_from_sounds)
+            logger.warning("%s not found: %s", kind, self.sounds_path / path_from_sounds)
+            return None
+        return self.sounds_path / path_from_sounds
 
     def load_effect(self, path_from_sounds):
         if path_from_sounds in self._effects_cache:
             return self._effects_cache[path_from_sounds]
+        if not self._ensure_mixer():
+            return None
         
-        full_path = self.sounds_path / path_from_sounds
-        if not full_path.exists():
-            print(f"---!!! FAILED TO FIND SOUND EFFECT AT: {full_path}")
+        full_path = self._find(path_from_sounds, "Sound effect")
+        if full_path is None:
             return None
             
         try:
             sound = pygame.mixer.Sound(str(full_path))
             self._effects_cache[path_from_sounds] = sound
             return sound
-        except pygame.error as e:
-            print(f"Error loading sound effect: {full_path}")
-            raise e
+        except pygame.error:
+            logger.error("Error loading sound effect: %s", full_path)
+            raise
+
+    def _active_voices(self):
+        """Channel indices that are still playing an effect we started."""
+        active = []
+        for i, voice in enumerate(self._voices):
+            if voice is not None and self._channels[i].get_busy():
+                active.append(i)
+            else:
+                self._voices[i] = None
+        return active
+
+    def _pick_channel(self, path_from_sounds, rule):
+        """
+        Chooses a channel for a new voice: the oldest voice of the same effect
+        once it is at its voice limit, else a free channel, else the oldest
+        voice with the lowest priority not above the new one. None if all
+        channels hold more important sounds.
+        """
+        active = self._active_voices()
+        same = [i for i in active if self._voices[i][0] == path_from_sounds]
+        if len(same) >= rule["voices"]:
+            return min(same, key=lambda i: self._voices[i][2])
+        if len(active) < len(self._channels):
+            return self._voices.index(None)
+        candidates = [i for i in active if self._voices[i][1] <= rule["priority"]]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda i: (self._voices[i][1], self._voices[i][2]))
 
     def play_effect(self, path_from_sounds, volume=1.0):
+        """
+        Plays an effect following its SOUND_EFFECT_RULES entry (voice limit,
+        priority, cooldown). Returns the channel, or None if it was dropped.
+        """
+        if self._mixer_ready is False:
+            return None
+        rule = SOUND_EFFECT_RULES.get(path_from_sounds, DEFAULT_SOUND_EFFECT_RULE)
+        now = time.monotonic()
+        # Spammed effects are dropped before any other work.
+        if now - self._last_played.get(path_from_sounds, float("-inf")) < rule["cooldown"]:
+            self.dropped_cooldown += 1
+            return None
+
         sound = self.load_effect(path_from_sounds)
-        if sound:
-            sound.set_volume(volume)
-            sound.play()
+        if not sound:
+            return None
 
-    def load_music(self, path_from_sounds):
-        if path_from_sounds in self._music_cache:
-            return self._music_cache[path_from_sounds]
-            
-        full_path = self.sounds_path / path_from_sounds
-        if not full_path.exists():
-            print(f"---!!! FAILED TO FIND MUSIC AT: {full_path}")
+        index = self._pick_channel(path_from_sounds, rule)
+        if index is None:
+            self.dropped_busy += 1
             return None
-        
-        self._music_cache[path_from_sounds] = str(full_path)
-        return str(full_path)
+        if self._voices[index] is not None:
+            self.stolen += 1
+
+        channel = self._channels[index]
+        channel.play(sound)
+        # Volume is per channel, so voices already playing keep theirs.
+        channel.set_volume(volume)
+        self._voices[index] = (path_from_sounds, rule["priority"], now)
+        self._last_played[path_from_sounds] = now
+        self.played += 1
+        return channel
+
+    def counters(self):
+        """Effect playback counters, including the voices playing right now."""
+        voices_by_effect = {}
+        for i in self._active_voices():
+            path = self._voices[i][0]
+            voices_by_effect[path] = voices_by_effect.get(path, 0) + 1
+        return {
+            "active_voices": sum(voices_by_effect.values()),
+            "voices_by_effect": voices_by_effect,
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped_cooldown": self.dropped_cooldown,
+            "dropped_busy": self.dropped_busy,
+        }
 
     def play_music(self, path_from_sounds, loops=-1):
-        music_path = self.load_music(path_from_sounds)
-        if music_path:
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(self.music_volume)
-            pygame.mixer.music.play(loops)
+        """
+        Starts a music track without blocking: it is decoded on a worker
+        thread and crossfaded in by update() once ready. Asking for the
+        track that is already playing (or loading) does nothing.
+        """
+        if path_from_sounds == self._music_track or not self._ensure_mixer():
+            return
+        full_path = self._find(path_from_sounds, "Music")
+        if full_path is None:
+            return
+
+        self._music_track = path_from_sounds
+        self._music_loading = None
+        # Coming back to the track that is fading out doesn't decode it again.
+        for loaded in self._music_sounds:
+            if loaded is not None and loaded[0] == path_from_sounds:
+                self._start_music(path_from_sounds, loaded[1], loops)
+                return
+        if self._music_executor is None:
+            self._music_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music-loader")
+        future = self._music_executor.submit(pygame.mixer.Sound, str(full_path))
+        self._music_loading = (path_from_sounds, future, loops)
+
+    def _start_music(self, path_from_sounds, sound, loops):
+        """Plays sound on the free music channel and fades it in over the current one."""
+        if self._music_fading_out is not None:
+            # A crossfade was still running; cut its outgoing track.
+            self._stop_music_channel(self._music_fading_out)
+        new_index = 0 if self._music_active in (None, 1) else 1
+        self._music_fading_out = self._music_active
+        self._music_active = new_index
+        self._music_sounds[new_index] = (path_from_sounds, sound)
+        self._music_channels[new_index].play(sound, loops=loops)
+        self._fade_elapsed = 0.0
+        self._apply_music_volume()
 
     def stop_music(self):
-        pygame.mixer.music.stop()
+        """Fades the current track out."""
+        self._music_track = None
+        self._music_loading = None
+        if not self._mixer_ready or self._music_active is None:
+            return
+        if self._music_fading_out is not None:
+            self._stop_music_channel(self._music_fading_out)
+        self._music_fading_out = self._music_active
+        self._music_active = None
+        self._fade_elapsed = 0.0
+        self._apply_music_volume()
+
+    def _stop_music_channel(self, index):
+        """Stops a music channel and lets go of its decoded track."""
+        self._music_channels[index].stop()
+        self._music_sounds[index] = None
+
+    def is_music_playing(self):
+        """True while a track is playing or still being loaded."""
+        return self._music_track is not None
+
+    def is_busy(self):
+        """True while music is loading or crossfading, which needs frequent update() calls."""
+        return self._music_loading is not None or self._fade_elapsed is not None
+
+    def update(self, dt):
+        """Starts music that finished loading and advances crossfades. Call once a frame."""
+        if self._music_loading and self._music_loading[1].done():
+            path_from_sounds, future, loops = self._music_loading
+            self._music_loading = None
+            try:
+                sound = future.result()
+            except pygame.error as e:
+                logger.error("Error loading music %s: %s", path_from_sounds, e)
+                self._music_track = None
+            else:
+                self._start_music(path_from_sounds, sound, loops)
+
+        if self._fade_elapsed is not None:
+            self._fade_elapsed += dt
+            self._apply_music_volume()
+            if self._fade_elapsed >= MUSIC_CROSSFADE:
+                if self._music_fading_out is not None:
+                    self._stop_music_channel(self._music_fading_out)
+                self._music_fading_out = None
+                self._fade_elapsed = None
 
 # Create a single, global instance
 sounds = SoundManager()
\ No newline at end of file
@@ -0,0 +1,88 @@
+# game/core/tiled_background.py
+
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from settings import BACKGROUND_TILE_SIZE, BACKGROUND_CACHE_SIZE
+
+class TiledBackground:
+    """
+    A scaled background split into tiles, of which only the ones inside the
+    viewport (and the current clip rect) are blitted.
+    Scaled variants are cached per key, e.g. (time of day, window size). A new
+    variant is shown with a fast nearest-neighbour scale straight away, and
+    the smoothscaled version is built on a worker thread and swapped in later.
+    """
+
+    def __init__(self, tile_size=BACKGROUND_TILE_SIZE, max_variants=BACKGROUND_CACHE_SIZE):
+        self.tile_size = tile_size
+        self.max_variants = max_variants
+        self._variants = OrderedDict()  # key -> list of (rect, tile) pairs
+        self._pending = {}  # key -> future of the smoothscaled surface
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+        self.key = None
+        self.size = (0, 0)
+        self.tiles = []
+
+    def set_image(self, key, original, size):
+        """Makes the variant of original scaled to size the visible one."""
+        self.key = key
+        self.size = size
+        if key in self._variants:
+            self._variants.move_to_end(key)
+        else:
+            # Show something immediately; the smooth version follows.
+            self._variants[key] = self._split(pygame.transform.scale(original, size))
+            self._pending[key] = self._executor.submit(pygame.transform.smoothscale, original, size)
+            self._evict()
+        self.tiles = self._variants[key]
+
+    def _evict(self):
+        """Drops the least recently used variants, e.g. after a resize storm."""
+        while len(self._variants) > self.max_variants:
+            key, _ = self._variants.popitem(last=False)
+            future = self._pending.pop(key, None)
+            if future:
+                future.cancel()
+
+    def _split(self, image):
+        """Cuts an image into tiles. Subsurfaces share the image's pixels."""
+        tiles = []
+        width, height = image.get_size()
+        for y in range(0, height, self.tile_size):
+            for x in range(0, width, self.tile_size):
+                rect = pygame.Rect(x, y, min(self.tile_size, width - x), min(self.tile_size, height - y))
+                tiles.append((rect, image.subsurface(rect)))
+        return tiles
+
+    def poll(self):
+        """
+        Swaps in any smoothscaled variants that finished building.
+        Returns True if the visible variant changed and needs a redraw.
+        """
+        changed = False
+        for key, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            if key in self._variants and not future.cancelled():
+                self._variants[key] = self._split(future.result())
+                if key == self.key:
+                    self.tiles = self._variants[key]
+                    changed = True
+        return changed
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def draw(self, screen, offset):
+        """Blits the tiles that overlap the screen's clip rect at offset."""
+        offset_x, offset_y = int(offset[0]), int(offset[1])
+        view = screen.get_clip()
+        for rect, tile in self.tiles:
+            tile_rect = rect.move(offset_x, offset_y)
+            if view.colliderect(tile_rect):
+                screen.blit(tile, tile_rect)
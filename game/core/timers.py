@@ -0,0 +1,121 @@
+# game/core/timers.py
+
+import heapq
+import itertools
+
+class Timer:
+    """A scheduled callback. Returned by TimerService.after/every."""
+
+    __slots__ = ("callback", "args", "interval", "due", "_service", "_entry", "_remaining")
+
+    def __init__(self, service, callback, args, interval):
+        self.callback = callback
+        self.args = args
+        # Seconds between repeats, or None for a one-shot timer
+        self.interval = interval
+        self.due = None
+        self._service = service
+        # Id of this timer's live heap entry; None when not scheduled
+        self._entry = None
+        # Time left while paused
+        self._remaining = None
+
+    @property
+    def active(self):
+        """True until the timer fires (one-shot) or is cancelled; paused timers count."""
+        return self._entry is not None or self._remaining is not None
+
+    @property
+    def paused(self):
+        return self._remaining is not None
+
+    def remaining(self):
+        """Seconds until the timer fires, or None if it is done."""
+        if self._remaining is not None:
+            return self._remaining
+        return max(0.0, self.due - self._service.time) if self._entry is not None else None
+
+    def cancel(self):
+        # The heap entry stays behind and is skipped when it comes up.
+        self._entry = None
+        self._remaining = None
+
+    def pause(self):
+        """Stops the countdown; resume() continues it where it left off."""
+        if self._entry is not None:
+            self._remaining = max(0.0, self.due - self._service.time)
+            self._entry = None
+
+    def resume(self):
+        if self._remaining is not None:
+            remaining, self._remaining = self._remaining, None
+            self._service._schedule(self, self._service.time + remaining)
+
+    def set_paused(self, paused):
+        if paused:
+            self.pause()
+        else:
+            self.resume()
+
+class TimerService:
+    """
+    One-shot and repeating callbacks on a clock advanced by update(dt).
+    Timers wait in a heap ordered by due time, so a frame only looks at
+    the timers that are due: O(log n) per timer fired, not O(n) per frame.
+    Each scene has one (BaseScene.timers), paused along with the scene.
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self.is_paused = False
+        self.fired = 0
+        self._heap = []
+        self._ids = itertools.count()
+
+    def after(self, delay, callback, *args):
+        """Calls callback(*args) once, delay seconds from now."""
+        timer = Timer(self, callback, args, None)
+        self._schedule(timer, self.time + delay)
+        return timer
+
+    def every(self, interval, callback, *args, delay=None):
+        """Calls callback(*args) every interval seconds, first after delay (default: interval)."""
+        if interval <= 0:
+            raise ValueError(f"Timer interval must be positive, not {interval}")
+        timer = Timer(self, callback, args, interval)
+        self._schedule(timer, self.time + (interval if delay is None else delay))
+        return timer
+
+    def _schedule(self, timer, due):
+        timer.due = due
+        timer._entry = next(self._ids)
+        heapq.heappush(self._heap, (due, timer._entry, timer))
+
+    def update(self, dt):
+        """Advances the clock and fires every timer that came due, in order."""
+        if self.is_paused:
+            return
+        self.time += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            due, entry, timer = heapq.heappop(heap)
+            if entry != timer._entry:
+                continue # Cancelled, paused or rescheduled since
+            if timer.interval is None:
+                timer._entry = None
+            else:
+                # Reschedule first so the callback can cancel it; a long
+                # frame fires it once per interval that passed.
+                self._schedule(timer, due + timer.interval)
+            self.fired += 1
+            timer.callback(*timer.args)
+
+    def pause(self):
+        self.is_paused = True
+
+    def resume(self):
+        self.is_paused = False
+
+    def pending(self):
+        """Number of scheduled, unpaused timers."""
+        return sum(1 for _, entry, timer in self._heap if entry == timer._entry)
@@ -3,6 +3,7 @@
 import pygame
 from settings import *
 from core.sound_manager import sounds
+from core.font_manager import fonts
 
 class Button:
     """A simple, clickable button with text."""
@@ -17,13 +18,19 @@ class Button:
         self.color_pressed = pygame.Color(80, 80, 100)   # Darker gray
         self.text_color = pygame.Color(255, 255, 255) # White
         
-        self.font = pygame.font.SysFont(font_name, font_size)
-        self.text_surf = self.font.render(text, True, self.text_color)
+        self.font = fonts.get_font(font_name, font_size)
+        self.text_surf = fonts.render(self.font, text, self.text_color)
         self.text_rect = self.text_surf.get_rect(center=self.rect.center)
         
         self.is_hovered = False
         self.is_pressed = False
 
+    def set_text(self, text):
+        """Changes the button's label."""
+        self.text = text
+        self.text_surf = fonts.render(self.font, text, self.text_color)
+        self.text_rect = self.text_surf.get_rect(center=self.rect.center)
+
     def handle_event(self, event):
         """Processes a single event to update the button's state."""
         if event.type == pygame.MOUSEMOTION:
@@ -38,6 +45,11 @@ class Button:
                 self.callback()
             self.is_pressed = False
 
+    def report_dirty(self, dirty):
+        """Reports the button's rect when its look has changed."""
+        # Long labels can spill past the button's edges.
+        dirty.track(self, self.rect.union(self.text_rect), (self.is_hovered, self.is_pressed, self.text_surf, tuple(self.color_normal)))
+
     def draw(self, screen):
         """Draws the button onto the given surface."""
         # Choose color based on state
@@ -49,4 +61,62 @@ class Button:
             color = self.color_normal
             
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
-        screen.blit(self.text_surf, self.text_rect)
\ No newline at end of file
+        screen.blit(self.text_surf, self.text_rect)
+
+class StatHud:
+    """
+    A pre-rendered panel of labelled stat bars.
+    The panel is only rebuilt when a bar's width changes by a whole pixel
+    or its color changes; the rest of the time drawing it is a single blit.
+    """
+    def __init__(self, font, position=(20, 20), bar_size=(200, 25), spacing=70):
+        self.font = font
+        self.position = position
+        self.bar_width, self.bar_height = bar_size
+        self.spacing = spacing  # Distance from one label to the next
+        self.label_height = 30  # Distance from a label to its bar
+
+        self.surface = None
+        self.rect = pygame.Rect(position, (0, 0))
+        self.rebuild_count = 0
+        self._layout_key = None
+
+    def update(self, bars):
+        """
+        Takes a list of (label, value, max_value, color) tuples.
+        Returns True if the panel had to be rebuilt.
+        """
+        layout_key = tuple(
+            (label, int((value / max_value) * self.bar_width), tuple(color))
+            for label, value, max_value, color in bars
+        )
+        if layout_key == self._layout_key:
+            return False
+
+        self._layout_key = layout_key
+        self._rebuild(layout_key)
+        return True
+
+    def _rebuild(self, layout_key):
+        """Renders all labels and bars into the cached panel surface."""
+        labels = [fonts.render(self.font, label, WHITE) for label, _, _ in layout_key]
+        width = max([self.bar_width] + [label.get_width() for label in labels])
+        height = (len(layout_key) - 1) * self.spacing + self.label_height + self.bar_height
+
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        for i, ((_, fill_width, color), label) in enumerate(zip(layout_key, labels)):
+            y = i * self.spacing
+            bar_y = y + self.label_height
+            self.surface.blit(label, (0, y))
+            pygame.draw.rect(self.surface, (50, 50, 50), (0, bar_y, self.bar_width, self.bar_height))
+            pygame.draw.rect(self.surface, color, (0, bar_y, fill_width, self.bar_height))
+            pygame.draw.rect(self.surface, WHITE, (0, bar_y, self.bar_width, self.bar_height), 2)
+
+        self.rect = self.surface.get_rect(topleft=self.position)
+        self.rebuild_count += 1
+
+    def draw(self, screen):
+        """Draws the cached panel."""
+        if self.surface:
+            screen.blit(self.surface, self.rect)
\ No newline at end of file
@@ -2,45 +2,73 @@
 
 import pygame
 from core.animation import Animation
-from entities.components.cat_rendering import CatRenderer
+from entities.components.cat_rendering import CatRenderer, HeadlessCatRenderer
 from entities.components.cat_stats import CatStats
 from entities.components.cat_behavior import CatBehavior
 from entities.components.cat_user_interactions import CatUserInteractions
 from entities.components.cat_data import CatData
 from entities.components.cat_chat import CatChat
+from core.timers import TimerService
 
 class Cat:
-    def __init__(self, position, initial_stats, scale=0.5, sleep_scale=None):
+    def __init__(self, position, initial_stats, scale=0.5, sleep_scale=None, timers=None, headless=False):
+        # The scene's timers, or our own, advanced in update()
+        self._owns_timers = timers is None
+        self.timers = TimerService() if timers is None else timers
         self.data = CatData(initial_stats)
         self.stats = CatStats(initial_stats)
         self.behavior = CatBehavior(position)
-        self.interactions = CatUserInteractions()
-        self.renderer = CatRenderer(self.data.customization_data, self.data.body_type, scale, sleep_scale)
-        self.chat = CatChat(initial_stats.get('name', 'kitty'))
+        self.interactions = CatUserInteractions(self.timers)
+        # Headless cats (simulations) load and compose no images
+        renderer_class = HeadlessCatRenderer if headless else CatRenderer
+        self.renderer = renderer_class(self.data.customization_data, self.data.body_type, scale, sleep_scale)
+        self.chat = CatChat(self.data.name)
         self.base_animation = Animation(self.renderer.layers['base']['idle'], 0.1, loop=False, pingpong=True)
         self.rect = None
+        self.draw_rect = None
         self.mask = None
+        self.hit_rect = None
         self.scale = scale
+        # Logical position at the previous simulation step, for interpolate()
+        self.previous_position = tuple(self.behavior.position)
         self._update_visuals()
 
+    @staticmethod
+    def asset_manifest(initial_stats):
+        """The images a Cat built from initial_stats will load, for resources.preload."""
+        return CatRenderer.asset_manifest(CatData(initial_stats).body_type)
+
     def _update_visuals(self):
         """Updates the visual representation of the cat."""
-        composed_image = self.renderer.compose_image(
+        variant = self.renderer.compose_image(
             self.base_animation.image,
             self.interactions.is_blinking,
             self.interactions.is_being_petted,
             self.interactions.is_hovered_by_food,
-            self.behavior.is_sleeping
+            self.behavior.is_sleeping,
+            frame_index=self.base_animation.frame_index,
+            accessories=self.data.accessories
         )
         
-        if composed_image:
+        if variant:
             # This is the crucial fix: Always create the visual rect using
             # the logical position as the center anchor. This ensures perfect sync.
-            self.rect = composed_image.get_rect(center=self.behavior.position)
-            self.mask = pygame.mask.from_surface(composed_image)
+            self.rect = pygame.Rect((0, 0), variant.body_size)
+            self.rect.center = self.behavior.position
+            # Baked accessories can stick out past the body.
+            self.draw_rect = variant.image.get_rect(topleft=(self.rect.x - variant.offset[0], self.rect.y - variant.offset[1]))
+            # The mask comes precomputed with the cached sprite variant.
+            self.mask = variant.mask
+            self.hit_rect = variant.bounds.move(self.rect.topleft)
 
-    def update(self, dt, update_stats=True):
-        """Updates all cat systems."""
+    def update(self, dt, update_stats=True, batched=False):
+        """
+        Updates all cat systems. With batched=True the stat change is only
+        queued; call stat_engine.step(dt) once after updating every cat.
+        """
+        self.previous_position = tuple(self.behavior.position)
+        if self._owns_timers:
+            self.timers.update(dt)
         if update_stats:
             # Check for automatic state changes
             if self.stats.is_exhausted() and not self.behavior.is_sleeping:
@@ -51,13 +79,14 @@ class Cat:
                 self.wake_up()
             
             # Update all components
-            self.stats.update(dt, self.interactions.is_being_petted, self.behavior.is_sleeping)
+            if batched:
+                self.stats.queue_update(self.interactions.is_being_petted, self.behavior.is_sleeping)
+            else:
+                self.stats.update(dt, self.interactions.is_being_petted, self.behavior.is_sleeping)
         
         self.behavior.update(dt) # This updates the logical position
         
-        # Determine current state for interactions
-        current_state = "SLEEPING" if self.behavior.is_sleeping else "MOVING" if self.behavior.target_position else "IDLE"
-        self.interactions.update(dt, self.base_animation, current_state)
+        self.interactions.update(dt, self.base_animation, self.current_state())
         
         if not self.behavior.is_sleeping:
             self.base_animation.update(dt)
@@ -67,18 +96,34 @@ class Cat:
         self._update_visuals()
 
 
+    def interpolate(self, alpha):
+        """Moves the sprite to where the cat is `alpha` of the way from the previous step to the current one."""
+        if not self.rect:
+            return
+        (x0, y0), (x1, y1) = self.previous_position, self.behavior.position
+        dx = round(x0 + (x1 - x0) * alpha) - self.rect.centerx
+        dy = round(y0 + (y1 - y0) * alpha) - self.rect.centery
+        if dx or dy:
+            self.rect.move_ip(dx, dy)
+            self.draw_rect.move_ip(dx, dy)
+            self.hit_rect.move_ip(dx, dy)
+
     def draw(self, screen):
         if self.renderer.scaled_image and self.rect:
-            screen.blit(self.renderer.scaled_image, self.rect)
-            if not self.behavior.is_sleeping:
-                self.renderer.draw_accessories(screen, self.rect, self.data.accessories, self.scale)
+            # Accessories are already baked into the sprite.
+            screen.blit(self.renderer.scaled_image, self.draw_rect)
+
+    def report_dirty(self, dirty):
+        """Reports the cat's screen area when its sprite, position or outfit changed."""
+        if self.draw_rect:
+            dirty.track(self, self.draw_rect, self.renderer.scaled_image)
 
     def handle_event(self, event):
         if self.behavior.is_sleeping and event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             if self.rect and self.rect.collidepoint(event.pos):
                 # Return True if the poke woke the cat up
                 return self.poke()
-        self.interactions.handle_event(event, self.rect, self.mask, self.behavior.state)
+        self.interactions.handle_event(event, self.rect, self.mask, self.behavior.state, self.hit_rect)
         return False
 
     def poke(self):
@@ -87,9 +132,19 @@ class Cat:
             return True # Return True because the cat woke up
         return False
 
+    def catch_up(self, seconds):
+        """Applies the stat changes (and naps) of `seconds` spent away, e.g. with the game closed."""
+        was_sleeping = self.behavior.is_sleeping
+        is_sleeping = self.stats.advance(seconds, was_sleeping)
+        if is_sleeping and not was_sleeping:
+            self.start_sleeping(self.bed_world_x, self.bed_world_y)
+        elif was_sleeping and not is_sleeping:
+            self.wake_up()
+
     def start_sleeping(self, bed_x, bed_y):
         if not self.behavior.is_sleeping:
             self.behavior.start_sleeping(bed_x, bed_y)
+            self.previous_position = tuple(self.behavior.position)
             self.interactions.start_sleeping()
 
     def wake_up(self, force=False):
@@ -99,10 +154,11 @@ class Cat:
 
     def set_position(self, x, y):
         self.behavior.set_position(x, y)
-        if self.rect:
-            self.rect.center = self.behavior.position
+        # A jump, not movement: don't interpolate from the old spot.
+        self.previous_position = tuple(self.behavior.position)
         self._update_visuals()
 
+    def current_state(self): return "SLEEPING" if self.behavior.is_sleeping else "MOVING" if self.behavior.target_position else "IDLE"
     def can_sleep(self): return self.stats.is_tired() and not self.behavior.is_sleeping
     def is_sleeping(self): return self.behavior.is_sleeping
     def get_chat_response(self, player_input): return "Zzz..." if self.is_sleeping() else self.chat.get_response(player_input)
@@ -116,6 +172,8 @@ class Cat:
 
     def collides_with_item(self, item):
         if self.is_sleeping() or not self.rect or not self.rect.colliderect(item.rect): return False
+        # Cheap box test against the opaque area before the pixel overlap test.
+        if self.hit_rect and not self.hit_rect.colliderect(item.rect): return False
         offset = (item.rect.x - self.rect.x, item.rect.y - self.rect.y)
         return self.mask.overlap(item.mask, offset) is not None
         
@@ -0,0 +1,151 @@
+# game/entities/components/cat_compositor.py
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; CatRenderer falls back to blits.
+    np = None
+
+def is_available():
+    """Returns True if the NumPy compositor can be used."""
+    return np is not None
+
+# Above this share of visible pixels, blitting whole planes beats gathering.
+SPARSE_LAYER_LIMIT = 0.5
+
+class _Layer:
+    """
+    A surface stored as four contiguous channel planes in row-major pixel
+    order. Mostly transparent layers (eyes, mouth) also keep the indices of
+    their visible pixels so blits only touch those.
+    """
+
+    def __init__(self, surface):
+        self.size = surface.get_size()
+        rgb = pygame.surfarray.array3d(surface).transpose(2, 1, 0).reshape(3, -1)
+        alpha = pygame.surfarray.array_alpha(surface).T.reshape(1, -1)
+        self.planes = np.ascontiguousarray(np.concatenate((rgb, alpha)))
+        self.visible = np.flatnonzero(self.planes[3])
+        self.transparent = self.planes[3] == 0
+        # Multiplying black by any color keeps it black.
+        self.clear_is_black = not self.planes[:3, self.transparent].any()
+        self.sparse = len(self.visible) < SPARSE_LAYER_LIMIT * self.planes.shape[1]
+
+def _multiply(rgb, color):
+    """Same as BLEND_MULT with an opaque color: RGB only, alpha untouched."""
+    return (rgb.astype(np.int32) * np.asarray(color[:3], dtype=np.int32)[:, None] + 255) >> 8
+
+def _div255(values):
+    """Exact values // 255 for 0 <= values <= 255 * 255, without a division."""
+    return (values + 1 + (values >> 8)) >> 8
+
+def _blit(dest, layer, color=None):
+    """
+    Same as a normal SRCALPHA-onto-SRCALPHA blit of layer (optionally
+    multiplied by color first), in place on the int32 planes in dest.
+    """
+    if layer.sparse:
+        src = layer.planes[:, layer.visible].astype(np.int32)
+        dst = dest[:, layer.visible]
+    else:
+        src = layer.planes.astype(np.int32)
+        dst = dest
+    if color is not None:
+        src[:3] = _multiply(src[:3], color)
+    src_alpha, dst_alpha = src[3], dst[3]
+
+    rgb = src[:3] - dst[:3]
+    rgb *= src_alpha
+    rgb += src[:3]
+    rgb >>= 8
+    rgb += dst[:3]
+    alpha = src_alpha + dst_alpha - _div255(src_alpha * dst_alpha)
+
+    # pygame copies the source where the destination is fully transparent.
+    empty = dst_alpha == 0
+    np.copyto(rgb, src[:3], where=empty)
+    np.copyto(alpha, src_alpha, where=empty)
+
+    if layer.sparse:
+        dest[:3, layer.visible] = rgb
+        dest[3, layer.visible] = alpha
+        # That copy also applies to the invisible source pixels we skipped,
+        # whose color still matters to smoothscale later on.
+        holes = layer.transparent & (dest[3] == 0)
+        hole_rgb = layer.planes[:3]
+        if color is not None and not layer.clear_is_black:
+            hole_rgb = _multiply(hole_rgb, color)
+        np.copyto(dest[:3], hole_rgb, where=holes)
+    else:
+        dest[:3] = rgb
+        dest[3] = alpha
+
+def _to_surface(planes, size):
+    """Turns RGBA planes back into a surface."""
+    pixels = np.ascontiguousarray(planes.T.astype(np.uint8))
+    surface = pygame.image.frombuffer(pixels.tobytes(), size, "RGBA")
+    return surface.convert_alpha() if pygame.display.get_surface() else surface.copy()
+
+class NumpyCompositor:
+    """
+    Composes cat sprites with vectorized integer math on layer arrays that
+    are precomputed once. It follows the exact rounding of the blit path in
+    cat_rendering, so both produce the same pixels, and it creates no
+    temporary surfaces along the way.
+    """
+
+    def __init__(self, layers):
+        self.frames = {id(frame): _Layer(frame) for frame in layers["base"]["idle"]}
+        self.layers = {
+            name: _Layer(layer)
+            for name, layer in layers.items()
+            if name != "base" and layer is not None
+        }
+
+        # The shade only ever multiplies the RGB channels, so bake it once:
+        # an opaque white layer with the shade drawn on top.
+        self.shadow_rgb = None
+        if "shade" in self.layers:
+            white = np.full(self.layers["shade"].planes.shape, 255, dtype=np.int32)
+            _blit(white, self.layers["shade"])
+            self.shadow_rgb = white[:3]
+
+    def compose(self, base_frame, colors, eyes_closed, is_hovered_by_food):
+        """Returns the unscaled awake sprite for the given frame surface."""
+        base_color, pattern_color, eye_color, nose_color = colors
+        frame = self.frames[id(base_frame)]
+        final = frame.planes.astype(np.int32)
+        final[:3] = _multiply(final[:3], base_color)
+
+        if pattern_color and "pattern" in self.layers:
+            _blit(final, self.layers["pattern"], pattern_color)
+
+        if self.shadow_rgb is not None:
+            final[:3] = (final[:3] * self.shadow_rgb + 255) >> 8
+
+        if is_hovered_by_food and "mouth_eat" in self.layers:
+            _blit(final, self.layers["mouth_eat"])
+        elif "mouth_outline" in self.layers:
+            _blit(final, self.layers["mouth_outline"])
+        if "mouth_color" in self.layers:
+            _blit(final, self.layers["mouth_color"], nose_color)
+
+        if eyes_closed and "eye_blink" in self.layers:
+            _blit(final, self.layers["eye_blink"])
+        else:
+            if "eye_color" in self.layers:
+                _blit(final, self.layers["eye_color"], eye_color)
+            if "eye_outline" in self.layers:
+                _blit(final, self.layers["eye_outline"])
+
+        return _to_surface(final, frame.size)
+
+    def compose_sleep(self, base_color):
+        """Returns the unscaled sleeping sprite."""
+        if "sleep" not in self.layers:
+            return None
+        layer = self.layers["sleep"]
+        final = layer.planes.astype(np.int32)
+        final[:3] = _multiply(final[:3], base_color)
+        return _to_surface(final, layer.size)
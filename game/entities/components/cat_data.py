@@ -5,6 +5,7 @@ class CatData:
     
     def __init__(self, initial_stats=None):
         self.unique_id = initial_stats.get("cat_id", "custom_cat") if initial_stats else "custom_cat"
+        self.name = initial_stats.get("name", "kitty") if initial_stats else "kitty"
         self.customization_data = initial_stats.get("customization", {}) if initial_stats else {}
         self.body_type = self.customization_data.get("body_type", "shorthair")
         self.accessories = initial_stats.get("accessories", {}) if initial_stats else {}
@@ -17,6 +18,7 @@ class CatData:
         """Exports all cat data to a savable dictionary."""
         return {
             "cat_id": self.unique_id,
+            "name": self.name,
             "hunger": stats.hunger,
             "happiness": stats.happiness,
             "energy": stats.energy,
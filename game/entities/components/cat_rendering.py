@@ -1,7 +1,13 @@
 # game/entities/components/cat_rendering.py
 
+import logging
 import pygame
+from collections import OrderedDict
 from core.resource_manager import resources
+from entities.components import cat_compositor
+from settings import SPRITE_CACHE_SIZE, SHEET_INDEX_NAME, COMPOSITOR
+
+logger = logging.getLogger(__name__)
 
 def colorize_image(image, color):
     """Tints a grayscale image with a color using fast blending."""
@@ -37,6 +43,80 @@ def apply_shadow(base_image, shadow_image):
     
     return result
 
+# Layer files relative to a body type's folder
+SLEEP_LAYER = "base/sleep/001.png"
+OPTIONAL_LAYERS = {
+    "shade": "base/shade.png",
+    "pattern": "patterns/idle/01.png",
+    "eye_color": "eyes/idle/01_color.png",
+    "eye_outline": "eyes/idle/01.png",
+    "eye_blink": "eyes/idle/01_blink.png", 
+    "mouth_color": "mouth/idle/01_color.png",
+    "mouth_outline": "mouth/idle/01.png",
+    "mouth_eat": "mouth/eat/01.png",
+}
+
+def _color_key(color):
+    """Returns a hashable version of a color (JSON saves give us lists)."""
+    return tuple(color) if color else None
+
+class SpriteVariant:
+    """
+    A finished sprite together with the collision data built from it.
+    Sprites with accessories baked in reuse the collision data of the plain
+    body sprite; offset says where the body's topleft sits inside the image.
+    """
+
+    def __init__(self, image, body=None, offset=(0, 0)):
+        self.image = image
+        self.offset = offset
+        if body:
+            self.mask = body.mask
+            self.bounds = body.bounds
+            self.body_size = body.body_size
+        else:
+            self.mask = pygame.mask.from_surface(image)
+            # Tight box around the opaque pixels, relative to the sprite's topleft.
+            rects = self.mask.get_bounding_rects()
+            self.bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+            self.body_size = image.get_size()
+
+class SpriteCache:
+    """
+    A bounded LRU cache of finished, scaled cat sprites (as SpriteVariants).
+    Keys describe everything that affects the final pixels of a sprite.
+    """
+
+    def __init__(self, max_size=SPRITE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached sprite for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, sprite):
+        """Stores a sprite, evicting the least recently used one if full."""
+        self._entries[key] = sprite
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every cached sprite (the counters are kept)."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
 class CatRenderer:
     """Handles all visual rendering and image composition for a cat."""
     
@@ -48,63 +128,121 @@ class CatRenderer:
         self.layers = self._load_layers()
         self.image = None
         self.scaled_image = None
-        self.sleep_image = None  # Store the sleep image
+        self.variant = None
         self.sleep_scale = sleep_scale if sleep_scale is not None else scale
+        self.sprite_cache = SpriteCache()
+
+        self.compositor = None
+        self._numpy_compositor = None
+        self.set_compositor(COMPOSITOR)
     
+    @staticmethod
+    def asset_manifest(body_type="shorthair"):
+        """
+        The files _load_layers reads for a body type, for resources.preload.
+        Missing optional layers are fine; preloading just skips them.
+        """
+        path_prefix = f"images/cats/custom/{body_type}"
+        sheet_index = f"{path_prefix}/{SHEET_INDEX_NAME}"
+        if resources.exists(sheet_index):
+            return [sheet_index]
+
+        manifest = [f"{path_prefix}/base/idle/{name}" for name in resources.list_dir(f"{path_prefix}/base/idle", ".png")]
+        manifest.append(f"{path_prefix}/{SLEEP_LAYER}")
+        manifest.extend(f"{path_prefix}/{path}" for path in OPTIONAL_LAYERS.values())
+        return manifest
+
     def _load_layers(self):
-        """Loads all visual layers for the cat."""
+        """
+        Loads all visual layers for the cat, from the body type's packed
+        sprite sheet if there is one, otherwise from the loose PNG files.
+        """
         path_prefix = f"images/cats/custom/{self.body_type}"
-        
-        # Load base animation frames
-        base_frames = []
-        frame_path = resources.assets_path / path_prefix / "base" / "idle"
-        if frame_path.is_dir():
-            for frame_file in sorted(frame_path.glob("*.png")):
-                relative_path = frame_file.relative_to(resources.assets_path)
-                base_frames.append(resources.load_image(relative_path.as_posix()))
+        sheet_index = f"{path_prefix}/{SHEET_INDEX_NAME}"
+
+        if resources.exists(sheet_index):
+            frames = resources.load_sheet(sheet_index)
+            base_frames = [frames[name] for name in sorted(frames) if name.startswith("base/idle/")]
+
+            def load_layer(name):
+                if name not in frames:
+                    raise FileNotFoundError(f"'{name}' is not in sprite sheet {sheet_index}")
+                return frames[name]
+        else:
+            # Load base animation frames
+            base_frames = [resources.load_image(f"{path_prefix}/base/idle/{name}")
+                           for name in resources.list_dir(f"{path_prefix}/base/idle", ".png")]
+
+            def load_layer(name):
+                if not resources.exists(f"{path_prefix}/{name}"):
+                    raise FileNotFoundError(f"Layer not found at {path_prefix}/{name}")
+                return resources.load_image(f"{path_prefix}/{name}")
         
         if not base_frames:
-            raise FileNotFoundError(f"No base animation frames found for '{self.body_type}' at {frame_path}")
+            raise FileNotFoundError(f"No base animation frames found for '{self.body_type}' at {path_prefix}")
 
         layers = {"base": {"idle": base_frames}}
         
         # Load sleep image
-        sleep_path = f"{path_prefix}/base/sleep/001.png"
         try:
-            layers["sleep"] = resources.load_image(sleep_path)
+            layers["sleep"] = load_layer(SLEEP_LAYER)
         except (FileNotFoundError, pygame.error):
             # If no sleep image, use first idle frame as fallback
             layers["sleep"] = base_frames[0] if base_frames else None
-            print(f"Warning: Sleep image not found at {sleep_path}, using idle frame")
+            logger.warning("Sleep image not found at %s/%s, using idle frame", path_prefix, SLEEP_LAYER)
         
         # Load optional layers
-        optional_layers = {
-            "shade": f"{path_prefix}/base/shade.png",
-            "pattern": f"{path_prefix}/patterns/idle/01.png",
-            "eye_color": f"{path_prefix}/eyes/idle/01_color.png",
-            "eye_outline": f"{path_prefix}/eyes/idle/01.png",
-            "eye_blink": f"{path_prefix}/eyes/idle/01_blink.png", 
-            "mouth_color": f"{path_prefix}/mouth/idle/01_color.png",
-            "mouth_outline": f"{path_prefix}/mouth/idle/01.png",
-            "mouth_eat": f"{path_prefix}/mouth/eat/01.png",
-        }
-        
-        for layer_name, path in optional_layers.items():
+        for layer_name, path in OPTIONAL_LAYERS.items():
             try:
-                layers[layer_name] = resources.load_image(path)
+                layers[layer_name] = load_layer(path)
             except (FileNotFoundError, pygame.error):
                 layers[layer_name] = None
         
         return layers
     
+    def set_compositor(self, name):
+        """
+        Chooses how layers are combined: "blend" uses pygame blits, "numpy"
+        uses the vectorized NumpyCompositor. Both give the same pixels.
+        """
+        if name == "numpy" and not cat_compositor.is_available():
+            logger.warning("NumPy is not installed, using the blend compositor")
+            name = "blend"
+        if name == "numpy" and self._numpy_compositor is None:
+            self._numpy_compositor = cat_compositor.NumpyCompositor(self.layers)
+        self.compositor = name
+        self.sprite_cache.clear()
+
+    def _scale(self, image, scale):
+        """Returns image smoothscaled by scale."""
+        if scale != 1.0:
+            new_size = (int(image.get_width() * scale), 
+                       int(image.get_height() * scale))
+            return pygame.transform.smoothscale(image, new_size)
+        return image
+
     def update_customization(self, new_data):
         """Updates customization data and forces re-composition."""
         self.customization_data = new_data
+        self.sprite_cache.clear()
+
+    def _colors_key(self):
+        """The customization colors that affect the composed sprite."""
+        data = self.customization_data
+        return (
+            _color_key(data.get("base_color", (200, 150, 100))),
+            _color_key(data.get("pattern_color")),
+            _color_key(data.get("eye_color", (70, 150, 220))),
+            _color_key(data.get("nose_color", (255, 182, 193))),
+        )
     
     def compose_sleep_image(self):
         """Creates the sleeping cat image."""
         if not self.layers.get("sleep"):
             return None
+
+        if self.compositor == "numpy":
+            return self._scale(self._numpy_compositor.compose_sleep(self._colors_key()[0]), self.sleep_scale)
         
         base_frame = self.layers["sleep"]
         final_image = pygame.Surface(base_frame.get_size(), pygame.SRCALPHA)
@@ -123,26 +261,80 @@ class CatRenderer:
         # and will not align with the sleeping pose. This ensures the correct sleep sprite is shown.
         
         # Scale the image
-        if self.sleep_scale != 1.0:
-            new_size = (int(final_image.get_width() * self.sleep_scale), 
-                       int(final_image.get_height() * self.sleep_scale))
-            return pygame.transform.smoothscale(final_image, new_size)
-        return final_image
+        return self._scale(final_image, self.sleep_scale)
     
-    def compose_image(self, base_frame, is_blinking=False, is_being_petted=False, is_hovered_by_food=False, is_sleeping=False):
-        """Creates the final cat image by layering and coloring components."""
-        # If sleeping, return the sleep image
+    def compose_image(self, base_frame, is_blinking=False, is_being_petted=False, is_hovered_by_food=False, is_sleeping=False, frame_index=None, accessories=None):
+        """
+        Returns the SpriteVariant for the cat's current look, composing it
+        only if this exact variant is not already in the sprite cache.
+        Equipped accessories are baked into the sprite (not while sleeping).
+        """
         if is_sleeping:
-            if not self.sleep_image:
-                self.sleep_image = self.compose_sleep_image()
-            self.scaled_image = self.sleep_image
-            self.image = self.sleep_image
-            return self.scaled_image
-        
-        # Otherwise, compose normal image
-        if not base_frame:
+            body_key = ("sleep", self._colors_key()[0], self.sleep_scale)
+        else:
+            if not base_frame:
+                return None
+            # Blinking and petting both draw the closed-eye layer.
+            frame_key = frame_index if frame_index is not None else base_frame
+            body_key = (frame_key, is_blinking or is_being_petted, is_hovered_by_food,
+                        self._colors_key(), self.scale)
+        accessories_key = tuple(sorted(accessories.items())) if accessories and not is_sleeping else ()
+        key = body_key + (accessories_key,) if accessories_key else body_key
+
+        variant = self.sprite_cache.get(key)
+        if variant is None:
+            body = self.sprite_cache.get(body_key) if accessories_key else None
+            if body is None:
+                if is_sleeping:
+                    image = self.compose_sleep_image()
+                else:
+                    image = self._compose_awake_image(base_frame, is_blinking, is_being_petted, is_hovered_by_food)
+                if image is None:
+                    return None
+                # The mask is built once here and reused for every later hit-test.
+                body = SpriteVariant(image)
+                self.sprite_cache.put(body_key, body)
+            variant = self._bake_accessories(body, accessories) if accessories_key else body
+            self.sprite_cache.put(key, variant)
+
+        self.variant = variant
+        self.image = variant.image
+        self.scaled_image = variant.image
+        return variant
+
+    def _bake_accessories(self, body, accessories):
+        """Composites the equipped accessories onto a copy of a body sprite."""
+        body_rect = pygame.Rect((0, 0), body.body_size)
+        blits = self.accessory_blits(body_rect, accessories, self.scale)
+        if not blits:
+            return body
+
+        # Accessories can stick out past the body, so grow the canvas to fit.
+        canvas_rect = body_rect.unionall([image.get_rect(topleft=pos) for image, pos in blits])
+        image = pygame.Surface(canvas_rect.size, pygame.SRCALPHA)
+        image.fill((0, 0, 0, 0))
+        offset = (-canvas_rect.x, -canvas_rect.y)
+        image.blit(body.image, offset)
+        for accessory_image, (x, y) in blits:
+            image.blit(accessory_image, (x + offset[0], y + offset[1]))
+        return SpriteVariant(image, body=body, offset=offset)
+
+    def _load_accessory(self, path, scale):
+        """Loads an accessory image, or returns None if it doesn't exist."""
+        try:
+            return resources.load_image(path, scale=scale)
+        except FileNotFoundError:
+            # resources logs each missing path once and remembers it
             return None
 
+    def _compose_awake_image(self, base_frame, is_blinking, is_being_petted, is_hovered_by_food):
+        """Creates the final cat image by layering and coloring components."""
+        if self.compositor == "numpy":
+            final_image = self._numpy_compositor.compose(
+                base_frame, self._colors_key(), is_blinking or is_being_petted, is_hovered_by_food)
+            return self._scale(final_image, self.scale)
+
+
         final_image = pygame.Surface(base_frame.get_size(), pygame.SRCALPHA)
         final_image.fill((0, 0, 0, 0))
         
@@ -173,16 +365,8 @@ class CatRenderer:
         self._apply_mouth(final_image, is_hovered_by_food)
         self._apply_eyes(final_image, is_blinking, is_being_petted)
 
-        # Store and scale the image
-        self.image = final_image
-        if self.scale != 1.0:
-            new_size = (int(final_image.get_width() * self.scale), 
-                       int(final_image.get_height() * self.scale))
-            self.scaled_image = pygame.transform.smoothscale(final_image, new_size)
-        else:
-            self.scaled_image = final_image
-        
-        return self.scaled_image
+        # Scale the image
+        return self._scale(final_image, self.scale)
     
     def _apply_mouth(self, final_image, is_hovered_by_food):
         """Applies mouth graphics to the final image."""
@@ -219,52 +403,88 @@ class CatRenderer:
             if self.layers.get("eye_outline"):
                 final_image.blit(self.layers["eye_outline"], (0, 0))
     
-    def draw_accessories(self, screen, rect, accessories, scale):
-        """Enhanced accessory drawing with better positioning and scaling."""
+    def accessory_blits(self, rect, accessories, scale):
+        """Returns (image, position) pairs for every equipped accessory."""
+        blits = []
+
         # Head accessories (hats, etc.)
         head_accessory = accessories.get("head")
         if head_accessory:
-            path = f"images/items/clothes/hats/{head_accessory}.png"
-            try:
-                # Scale the accessory appropriately based on cat scale
-                accessory_scale = 0.2 * scale  # Reduced from 0.75 for better proportion
-                accessory_image = resources.load_image(path, scale=accessory_scale)
-                
+            # Scale the accessory appropriately based on cat scale
+            accessory_scale = 0.2 * scale  # Reduced from 0.75 for better proportion
+            accessory_image = self._load_accessory(f"images/items/clothes/hats/{head_accessory}.png", accessory_scale)
+            if accessory_image:
                 # Better positioning calculation - higher up and more centered
                 accessory_pos = (
                     rect.centerx - (accessory_image.get_width()+10), 
                     rect.y - 25 * scale  # Moved up more
                 )
-                screen.blit(accessory_image, accessory_pos)
-            except FileNotFoundError:
-                print(f"Warning: Accessory image not found at {path}")
+                blits.append((accessory_image, accessory_pos))
         
         # Body accessories (future: collars, shirts, etc.)
         body_accessory = accessories.get("body")
         if body_accessory:
-            path = f"images/items/clothes/body/{body_accessory}.png"
-            try:
-                accessory_image = resources.load_image(path, scale=scale)
+            accessory_image = self._load_accessory(f"images/items/clothes/body/{body_accessory}.png", scale)
+            if accessory_image:
                 # Position on cat's body
                 accessory_pos = (
                     rect.centerx - accessory_image.get_width() / 2,
                     rect.centery - accessory_image.get_height() / 2
                 )
-                screen.blit(accessory_image, accessory_pos)
-            except FileNotFoundError:
-                print(f"Warning: Body accessory image not found at {path}")
+                blits.append((accessory_image, accessory_pos))
         
         # Other accessories (future: bows, jewelry, etc.)
         other_accessory = accessories.get("accessories")
         if other_accessory:
-            path = f"images/items/clothes/accessories/{other_accessory}.png"
-            try:
-                accessory_image = resources.load_image(path, scale=0.5 * scale)  # Smaller scale
+            accessory_image = self._load_accessory(f"images/items/clothes/accessories/{other_accessory}.png", 0.5 * scale)  # Smaller scale
+            if accessory_image:
                 # Position as needed
                 accessory_pos = (
                     rect.centerx - accessory_image.get_width() / 2,
                     rect.bottom - 30 * scale
                 )
-                screen.blit(accessory_image, accessory_pos)
-            except FileNotFoundError:
-                print(f"Warning: Accessory image not found at {path}")
\ No newline at end of file
+                blits.append((accessory_image, accessory_pos))
+
+        # Whole-pixel positions, so the baked layout matches the old per-frame one.
+        return [(image, (int(x), int(y))) for image, (x, y) in blits]
+
+class HeadlessCatRenderer:
+    """
+    Stands in for CatRenderer when nothing is drawn (tools/simulate.py).
+    Loads no images and composes nothing: every look is the same blank,
+    opaque placeholder, so the cat still gets a rect and mask to hit-test.
+    """
+
+    # Idle frames to animate when the body type's art isn't there to count
+    DEFAULT_IDLE_FRAMES = 8
+    PLACEHOLDER_SIZE = (300, 300)
+
+    def __init__(self, customization_data, body_type="shorthair", scale=0.5, sleep_scale=None):
+        self.customization_data = customization_data
+        self.body_type = body_type
+        self.scale = scale
+        self.sleep_scale = sleep_scale if sleep_scale is not None else scale
+
+        # As many idle frames as the real art has, so idle sequences last as long.
+        frame_count = len(resources.list_dir(f"images/cats/custom/{body_type}/base/idle", ".png")) or self.DEFAULT_IDLE_FRAMES
+        frame = pygame.Surface(self.PLACEHOLDER_SIZE, pygame.SRCALPHA)
+        self.layers = {"base": {"idle": [frame] * frame_count}, "sleep": frame}
+        self._awake = SpriteVariant(self._placeholder(scale))
+        self._asleep = SpriteVariant(self._placeholder(self.sleep_scale))
+        self.variant = None
+        self.image = None
+        self.scaled_image = None
+
+    def _placeholder(self, scale):
+        width, height = self.PLACEHOLDER_SIZE
+        image = pygame.Surface((int(width * scale), int(height * scale)), pygame.SRCALPHA)
+        image.fill((255, 0, 255, 255))
+        return image
+
+    def update_customization(self, new_data):
+        self.customization_data = new_data
+
+    def compose_image(self, base_frame, is_blinking=False, is_being_petted=False, is_hovered_by_food=False, is_sleeping=False, frame_index=None, accessories=None):
+        self.variant = self._asleep if is_sleeping else self._awake
+        self.image = self.scaled_image = self.variant.image
+        return self.variant
@@ -1,50 +1,126 @@
 # game/entities/components/cat_stats.py
 
+import logging
+import math
+import weakref
+from entities.components.stat_engine import stat_engine, HUNGER, HAPPINESS, ENERGY
 from settings import (
+    SIM_HZ,
     MAX_STAT_VALUE,
     HUNGER_DECAY_RATE,
     HAPPINESS_DECAY_RATE,
-    HAPPINESS_INCREASE_RATE,
     FOOD_HUNGER_REPLENISH,
     ENERGY_DECAY_RATE,
     ENERGY_REPLENISH_RATE,
     WAKE_UP_HAPPINESS_PENALTY,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _stat_property(column, doc):
+    """A CatStats attribute stored in the cat's engine row."""
+    return property(lambda self: self.engine.get(self.row, column),
+                    lambda self, value: self.engine.set(self.row, column, value), doc=doc)
 
 class CatStats:
-    """Manages all stat-related logic for a cat."""
-
-    def __init__(self, initial_stats=None):
-        self.hunger = initial_stats.get("hunger", 80.0) if initial_stats else 80.0
-        self.happiness = (
-            initial_stats.get("happiness", 60.0) if initial_stats else 60.0
-        )
-        self.energy = initial_stats.get("energy", 100.0) if initial_stats else 100.0
+    """
+    Manages all stat-related logic for a cat. The values live in a row of
+    a StatEngine (the shared one unless given), so many cats' stats can be
+    stepped together; the row is freed when this object is collected.
+    """
+
+    hunger = _stat_property(HUNGER, "Fullness, 0 (starving) to max_stat.")
+    happiness = _stat_property(HAPPINESS, "0 to max_stat.")
+    energy = _stat_property(ENERGY, "0 (exhausted) to max_stat.")
+
+    def __init__(self, initial_stats=None, engine=None):
+        initial_stats = initial_stats or {}
+        self.engine = engine if engine is not None else stat_engine
+        self.row = self.engine.allocate(initial_stats.get("hunger", 80.0),
+                                        initial_stats.get("happiness", 60.0),
+                                        initial_stats.get("energy", 100.0))
+        weakref.finalize(self, self.engine.free, self.row)
         self.max_stat = MAX_STAT_VALUE
 
     def update(self, dt, is_being_petted=False, is_sleeping=False):
         """Updates all stats based on time and conditions."""
-        # Natural decay
-        self.hunger -= HUNGER_DECAY_RATE * dt
-        self.happiness -= HAPPINESS_DECAY_RATE * dt
-
-        # Energy management
-        if is_sleeping:
-            # Restore energy while sleeping
-            self.energy += ENERGY_REPLENISH_RATE * dt
-        else:
-            # Drain energy while awake
-            self.energy -= ENERGY_DECAY_RATE * dt
-
-        # Happiness increase when being petted (works while sleeping too)
-        if is_being_petted:
-            self.happiness += HAPPINESS_INCREASE_RATE * dt
-
-        # Clamp values
-        self.hunger = max(0, min(self.hunger, self.max_stat))
-        self.happiness = max(0, min(self.happiness, self.max_stat))
-        self.energy = max(0, min(self.energy, self.max_stat))
+        self.engine.update_row(self.row, dt, is_being_petted, is_sleeping)
+
+    def queue_update(self, is_being_petted=False, is_sleeping=False):
+        """Like update(), but applied with every other queued cat by the engine's next step(dt)."""
+        self.engine.queue(self.row, is_being_petted, is_sleeping)
+
+    def advance(self, seconds, is_sleeping=False, step=1 / SIM_HZ):
+        """
+        Jumps the stats forward by `seconds`, giving the same result as
+        calling update() every `step` seconds with no petting while the cat
+        falls asleep when exhausted and wakes when fully rested (as
+        Cat.update does), without running the ticks. Used for the time the
+        game was closed. Returns whether the cat is asleep at the end.
+        """
+        frames, remainder = divmod(max(0.0, seconds), step)
+        frames = int(frames)
+
+        # Hunger and happiness only ever decay here, so they can't bounce off a clamp.
+        self.hunger = max(0, min(self.hunger - HUNGER_DECAY_RATE * step * frames, self.max_stat))
+        self.happiness = max(0, min(self.happiness - HAPPINESS_DECAY_RATE * step * frames, self.max_stat))
+        is_sleeping = self._advance_energy(frames, step, is_sleeping)
+
+        # The leftover part of a frame is one ordinary tick.
+        if remainder > 0:
+            is_sleeping = self._next_sleep_state(is_sleeping, self.energy)
+            self.update(remainder, is_sleeping=is_sleeping)
+        return is_sleeping
+
+    def _next_sleep_state(self, is_sleeping, energy):
+        """The sleep/wake check Cat.update makes before each tick."""
+        if not is_sleeping and energy <= 0:
+            return True
+        if is_sleeping and energy >= self.max_stat:
+            return False
+        return is_sleeping
+
+    def _advance_energy(self, frames, step, is_sleeping):
+        """
+        Energy over `frames` ticks of the awake (drain to 0) / asleep
+        (refill to max) cycle. Each phase is jumped over whole, and whole
+        cycles are skipped with a modulo, so this costs the same for an
+        hour as for a year.
+        """
+        drain = ENERGY_DECAY_RATE * step
+        gain = ENERGY_REPLENISH_RATE * step
+        energy = max(0, min(self.energy, self.max_stat))
+        # Ticks per phase when starting from a full / empty bar: the phase
+        # ends on the tick that clamps the bar, and the state flips at the
+        # start of the next tick.
+        awake_ticks = math.ceil(self.max_stat / drain) if drain > 0 else math.inf
+        asleep_ticks = math.ceil(self.max_stat / gain) if gain > 0 else math.inf
+        cycle = awake_ticks + asleep_ticks
+
+        while frames > 0:
+            is_sleeping = self._next_sleep_state(is_sleeping, energy)
+            if is_sleeping:
+                ticks = math.ceil((self.max_stat - energy) / gain) if gain > 0 else math.inf
+                if ticks > frames:
+                    energy += gain * frames
+                    break
+                energy = self.max_stat
+            else:
+                if energy >= self.max_stat and cycle < math.inf:
+                    # Back at the start of a cycle: skip all the whole ones.
+                    frames %= cycle
+                    if frames == 0:
+                        break
+                ticks = math.ceil(energy / drain) if drain > 0 else math.inf
+                if ticks > frames:
+                    energy -= drain * frames
+                    break
+                energy = 0
+            frames -= ticks
+
+        self.energy = max(0, min(energy, self.max_stat))
+        return is_sleeping
 
     def is_exhausted(self):
         """Returns True if cat must sleep (energy at 0)."""
@@ -62,13 +138,13 @@ class CatStats:
         """Applies a happiness penalty for being woken up."""
         self.happiness -= WAKE_UP_HAPPINESS_PENALTY
         self.happiness = max(0, self.happiness)
-        print(f"Cat woken up early! Happiness is now {self.happiness:.1f}")
+        logger.info("Cat woken up early! Happiness is now %.1f", self.happiness)
 
     def feed(self):
         """Increases hunger when fed."""
         self.hunger += FOOD_HUNGER_REPLENISH
         self.hunger = min(self.hunger, self.max_stat)
-        print(f"Cat fed! Hunger is now {self.hunger:.1f}")
+        logger.info("Cat fed! Hunger is now %.1f", self.hunger)
 
     def to_dict(self):
         """Returns stats as a dictionary for saving."""
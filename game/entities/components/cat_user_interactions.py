@@ -1,35 +1,40 @@
 # game/entities/components/cat_user_interactions.py
 
+import logging
 import pygame
 import random
 from core.sound_manager import sounds
 
+logger = logging.getLogger(__name__)
+
 
 class CatUserInteractions:
     """Handles all user interactions like petting, feeding, clicking."""
 
-    def __init__(self):
+    def __init__(self, timers):
         self.is_being_petted = False
         self.is_hovered_by_food = False
+        self.timers = timers
+        self.base_animation = None
 
-        # Idle animation logic
-        self.idle_animation_timer = random.uniform(2, 7)
+        # Idle animation logic; the countdowns only run while the cat is idle
+        self.idle_animation_timer = timers.after(random.uniform(2, 7), self._start_idle_sequence)
         self.is_playing_idle_sequence = False
 
         # Blink animation logic
-        self.blink_timer = random.uniform(2.2, 7.4)
+        self.blink_timer = timers.after(random.uniform(2.2, 7.4), self._start_blink)
         self.is_blinking = False
         self.blink_duration = 0.20
-        self.blink_duration_timer = 0.0
 
         # Wake up logic
         self.pokes_to_wake = 0
         self.poke_count = 0
 
-    def handle_event(self, event, rect, mask, cat_state):
+    def handle_event(self, event, rect, mask, cat_state, hit_rect=None):
         """Processes user input events."""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1 and rect.collidepoint(event.pos):
+            # hit_rect is the box around the opaque pixels, checked before the mask.
+            if event.button == 1 and (hit_rect or rect).collidepoint(event.pos):
                 # Pixel-perfect check for petting
                 pos_in_mask = (event.pos[0] - rect.x, event.pos[1] - rect.y)
                 if mask and mask.get_at(pos_in_mask):
@@ -43,39 +48,42 @@ class CatUserInteractions:
                 self.is_being_petted = False
 
     def update(self, dt, base_animation, cat_state):
-        """Updates interaction-related animations and timers."""
-        # Don't do idle animations if sleeping or moving
-        if cat_state != "IDLE":
+        """Pauses or resumes the idle timers for the cat's state and ends finished idle sequences."""
+        self.base_animation = base_animation
+        is_idle = cat_state == "IDLE"
+        # Idle animations and blinks wait while sleeping or moving; blinks also while petted.
+        self.idle_animation_timer.set_paused(not is_idle)
+        self.blink_timer.set_paused(not is_idle or self.is_being_petted)
+
+        if not is_idle:
             self.is_playing_idle_sequence = False
             if base_animation.is_playing():
                 base_animation.pause()
             return
 
-        # Handle idle animation logic
-        self.idle_animation_timer -= dt
-        if self.idle_animation_timer <= 0 and not self.is_playing_idle_sequence:
-            self.is_playing_idle_sequence = True
-            num_frames = len(base_animation.frames)
-            # Play a random number of frames to make idle more dynamic
-            frames_to_play = random.randint(num_frames // 2, (num_frames -1) * 2)
-            base_animation.play(frames_to_play)
-
-        if self.is_playing_idle_sequence and base_animation.is_done:
+        if not self.is_playing_idle_sequence and not self.idle_animation_timer.active:
+            # The last sequence was cut short by sleeping or walking; play another.
+            self._start_idle_sequence()
+        elif self.is_playing_idle_sequence and base_animation.is_done:
             self.is_playing_idle_sequence = False
-            self.idle_animation_timer = random.uniform(2, 7)
-
-        # Handle blink animation logic (only if not being petted and idle)
-        if not self.is_being_petted and cat_state == "IDLE":
-            if not self.is_blinking:
-                self.blink_timer -= dt
-                if self.blink_timer <= 0:
-                    self.is_blinking = True
-                    self.blink_duration_timer = self.blink_duration
-            else:
-                self.blink_duration_timer -= dt
-                if self.blink_duration_timer <= 0:
-                    self.is_blinking = False
-                    self.blink_timer = random.uniform(1, 5)
+            self.idle_animation_timer = self.timers.after(random.uniform(2, 7), self._start_idle_sequence)
+
+    def _start_idle_sequence(self):
+        if self.base_animation is None:
+            return
+        self.is_playing_idle_sequence = True
+        num_frames = len(self.base_animation.frames)
+        # Play a random number of frames to make idle more dynamic
+        frames_to_play = random.randint(num_frames // 2, (num_frames -1) * 2)
+        self.base_animation.play(frames_to_play)
+
+    def _start_blink(self):
+        self.is_blinking = True
+        self.blink_timer = self.timers.after(self.blink_duration, self._end_blink)
+
+    def _end_blink(self):
+        self.is_blinking = False
+        self.blink_timer = self.timers.after(random.uniform(1, 5), self._start_blink)
 
     def set_food_hover(self, is_hovering):
         """Sets the flag for when food is hovering over the cat."""
@@ -85,14 +93,18 @@ class CatUserInteractions:
         """Resets poke counter when sleep begins."""
         self.pokes_to_wake = 2
         self.poke_count = 0
-        print(f"Cat needs {self.pokes_to_wake} pokes to wake up.")
+        # The blink timers wait while asleep; don't sleep with a blink half done.
+        if self.is_blinking:
+            self.blink_timer.cancel()
+            self._end_blink()
+        logger.debug("Cat needs %d pokes to wake up.", self.pokes_to_wake)
 
     def poke(self):
         """Increments poke count and returns True if cat should wake up."""
         if self.pokes_to_wake > 0:
             self.poke_count += 1
             sounds.play_effect("effects/poke.wav")
-            print(f"Poke {self.poke_count}/{self.pokes_to_wake}")
+            logger.debug("Poke %d/%d", self.poke_count, self.pokes_to_wake)
             if self.poke_count >= self.pokes_to_wake:
                 return True
         return False
\ No newline at end of file
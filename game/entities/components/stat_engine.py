@@ -0,0 +1,220 @@
+# game/entities/components/stat_engine.py
+
+from settings import (
+    MAX_STAT_VALUE,
+    HUNGER_DECAY_RATE,
+    HAPPINESS_DECAY_RATE,
+    HAPPINESS_INCREASE_RATE,
+    ENERGY_DECAY_RATE,
+    ENERGY_REPLENISH_RATE,
+    STAT_ENGINE_NUMPY_ROWS,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the engine falls back to Python lists.
+    np = None
+
+def is_available():
+    """Returns True if the NumPy engine can be used."""
+    return np is not None
+
+# Stat columns, in the order rows store them
+HUNGER, HAPPINESS, ENERGY = 0, 1, 2
+
+def step_stats(hunger, happiness, energy, dt, is_being_petted, is_sleeping):
+    """One cat's stats after dt seconds; the rules every engine follows."""
+    hunger -= HUNGER_DECAY_RATE * dt
+    happiness -= HAPPINESS_DECAY_RATE * dt
+    if is_sleeping:
+        energy += ENERGY_REPLENISH_RATE * dt
+    else:
+        energy -= ENERGY_DECAY_RATE * dt
+    # Petting works while sleeping too
+    if is_being_petted:
+        happiness += HAPPINESS_INCREASE_RATE * dt
+    return (max(0, min(hunger, MAX_STAT_VALUE)),
+            max(0, min(happiness, MAX_STAT_VALUE)),
+            max(0, min(energy, MAX_STAT_VALUE)))
+
+class PythonStatEngine:
+    """
+    The stat store without NumPy: one [hunger, happiness, energy] list per
+    row. Same interface and results as StatEngine, one cat at a time.
+    """
+
+    def __init__(self):
+        self._rows = []
+        self._free = []
+        # row -> (is_being_petted, is_sleeping), for the next step()
+        self._queued = {}
+
+    def allocate(self, hunger, happiness, energy):
+        """Stores a cat's stats and returns its row."""
+        if self._free:
+            row = self._free.pop()
+            self._rows[row] = [hunger, happiness, energy]
+        else:
+            row = len(self._rows)
+            self._rows.append([hunger, happiness, energy])
+        return row
+
+    def free(self, row):
+        """Releases a row for reuse (called when its CatStats is collected)."""
+        self._queued.pop(row, None)
+        self._free.append(row)
+
+    def get(self, row, column):
+        return self._rows[row][column]
+
+    def set(self, row, column, value):
+        self._rows[row][column] = value
+
+    def update_row(self, row, dt, is_being_petted=False, is_sleeping=False):
+        """Steps a single row now."""
+        self._rows[row] = list(step_stats(*self._rows[row], dt, is_being_petted, is_sleeping))
+
+    def queue(self, row, is_being_petted=False, is_sleeping=False):
+        """Includes a row in the next step(), with this frame's conditions."""
+        self._queued[row] = (is_being_petted, is_sleeping)
+
+    def step(self, dt):
+        """Steps every queued row by dt, then clears the queue."""
+        for row, (is_being_petted, is_sleeping) in self._queued.items():
+            self.update_row(row, dt, is_being_petted, is_sleeping)
+        self._queued.clear()
+
+    def __len__(self):
+        return len(self._rows) - len(self._free)
+
+class StatEngine:
+    """
+    Stats for many cats as a struct of arrays: one contiguous NumPy array
+    per stat, indexed by row, plus per-row petted/sleeping/queued flags.
+    step() applies decay, sleep replenishment, petting and clamping to all
+    queued cats in a handful of vectorized operations, with the same float
+    arithmetic as step_stats, so results match the one-cat path exactly.
+    """
+
+    def __init__(self, capacity=16):
+        self._values = np.zeros((3, capacity))
+        self._petted = np.zeros(capacity, dtype=bool)
+        self._sleeping = np.zeros(capacity, dtype=bool)
+        self._queued = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._free = []
+
+    @classmethod
+    def from_python(cls, engine):
+        """A StatEngine holding a PythonStatEngine's rows, at the same row numbers."""
+        size = len(engine._rows)
+        numpy_engine = cls(capacity=max(16, 2 * size))
+        if size:
+            numpy_engine._values[:, :size] = np.array(engine._rows, dtype=float).T
+        numpy_engine._size = size
+        numpy_engine._free = list(engine._free)
+        for row, (is_being_petted, is_sleeping) in engine._queued.items():
+            numpy_engine.queue(row, is_being_petted, is_sleeping)
+        return numpy_engine
+
+    def _grow(self):
+        capacity = self._values.shape[1] * 2
+        values = np.zeros((3, capacity))
+        values[:, :self._size] = self._values[:, :self._size]
+        self._values = values
+        for name in ("_petted", "_sleeping", "_queued"):
+            flags = np.zeros(capacity, dtype=bool)
+            flags[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, flags)
+
+    def allocate(self, hunger, happiness, energy):
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size == self._values.shape[1]:
+                self._grow()
+            row = self._size
+            self._size += 1
+        self._values[:, row] = (hunger, happiness, energy)
+        return row
+
+    def free(self, row):
+        self._queued[row] = False
+        self._free.append(row)
+
+    def get(self, row, column):
+        return float(self._values[column, row])
+
+    def set(self, row, column, value):
+        self._values[column, row] = value
+
+    def update_row(self, row, dt, is_being_petted=False, is_sleeping=False):
+        # One cat: plain floats beat NumPy's per-call overhead.
+        self._values[:, row] = step_stats(*self._values[:, row].tolist(), dt, is_being_petted, is_sleeping)
+
+    def queue(self, row, is_being_petted=False, is_sleeping=False):
+        self._queued[row] = True
+        self._petted[row] = is_being_petted
+        self._sleeping[row] = is_sleeping
+
+    def step(self, dt):
+        rows = np.flatnonzero(self._queued[:self._size])
+        if rows.size == 0:
+            return
+        self._queued[rows] = False
+        stats = self._values[:, rows]
+
+        stats[HUNGER] -= HUNGER_DECAY_RATE * dt
+        stats[HAPPINESS] -= HAPPINESS_DECAY_RATE * dt
+        stats[ENERGY] += np.where(self._sleeping[rows], ENERGY_REPLENISH_RATE * dt, -(ENERGY_DECAY_RATE * dt))
+        stats[HAPPINESS] += np.where(self._petted[rows], HAPPINESS_INCREASE_RATE * dt, 0.0)
+        np.clip(stats, 0, MAX_STAT_VALUE, out=stats)
+        self._values[:, rows] = stats
+
+    def __len__(self):
+        return self._size - len(self._free)
+
+class AdaptiveStatEngine:
+    """
+    A PythonStatEngine until it holds numpy_rows cats, then a StatEngine.
+    For a few cats NumPy's per-call overhead costs more than it saves
+    (see tools/bench_stats). Rows keep their numbers across the move,
+    and it doesn't move back when cats are freed.
+    """
+
+    def __init__(self, numpy_rows=STAT_ENGINE_NUMPY_ROWS):
+        self.numpy_rows = numpy_rows
+        self._use(PythonStatEngine())
+
+    def _use(self, engine):
+        self.engine = engine
+        # Bound once here, so calls cost no more than on the engine itself
+        self.get = engine.get
+        self.set = engine.set
+        self.update_row = engine.update_row
+        self.queue = engine.queue
+        self.step = engine.step
+
+    @property
+    def uses_numpy(self):
+        return isinstance(self.engine, StatEngine)
+
+    def allocate(self, hunger, happiness, energy):
+        row = self.engine.allocate(hunger, happiness, energy)
+        if not self.uses_numpy and is_available() and len(self.engine) >= self.numpy_rows:
+            self._use(StatEngine.from_python(self.engine))
+        return row
+
+    def free(self, row):
+        # Not bound in _use: CatStats hands this to weakref.finalize, which outlives a move.
+        self.engine.free(row)
+
+    def __len__(self):
+        return len(self.engine)
+
+def create_engine():
+    """An AdaptiveStatEngine: plain Python for a few cats, NumPy (if installed) for many."""
+    return AdaptiveStatEngine()
+
+# The shared store every CatStats lives in
+stat_engine = create_engine()
@@ -1,18 +1,26 @@
 # game/main.py
 
+import logging
 import pygame
 import sys
 import time
 
 from settings import *
 from core.scene_manager import SceneManager
+from core.frame_scheduler import FrameScheduler
 from scenes.menu import MenuScene
 from core.sound_manager import sounds
 from core.resource_manager import resources
+from core.font_manager import fonts
+import core.save_manager as save_manager
+
+logger = logging.getLogger(__name__)
 
 class Game:
     def __init__(self):
-        pygame.init()
+        # Not pygame.init(): the mixer is started by SoundManager on first use.
+        pygame.display.init()
+        pygame.font.init()
         
         # Set window position before creating the display
         import os
@@ -23,36 +31,56 @@ class Game:
         # Create window with resizable flag - this allows proper maximize behavior
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
 
-        try:
+        if resources.exists("images/ui_elements/cat_icon.png"):
             icon = resources.load_image("images/ui_elements/cat_icon.png", scale=(64, 64))  
             pygame.display.set_icon(icon)
-        except FileNotFoundError:
-            print("No custom icon found, using default snake icon.")
+        else:
+            logger.info("No custom icon found, using default snake icon.")
         
         self.clock = pygame.time.Clock()
-        self.last_time = time.time()
+        self.scheduler = FrameScheduler(self.clock, FPS, IDLE_FPS, IDLE_DELAY)
         self.running = True
         
         # Store cat data so it persists across scenes
         self.cat_data = None
+        # Which saved cat to play; None means the first one
+        self.cat_id = None
+        # When cat_data was saved, if it was just loaded from the save (for offline progress)
+        self.cat_saved_at = None
         
         # Fullscreen tracking
         self.fullscreen = False
         self.windowed_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
 
         # Create a font for the FPS counter
-        self.font = pygame.font.SysFont(DEFAULT_FONT_NAME, 24)
+        self.font = fonts.get_font(DEFAULT_FONT_NAME, 24)
+        self.fps_text = None
+        self.fps_surface = None
+        # Where the counter was drawn, and the scene's pixels it covers
+        self.fps_rect = None
+        self.fps_background = None
         
         self.scene_manager = SceneManager(self, MenuScene)
 
     def run(self):
-        """The main game loop."""
+        """
+        The main game loop. The simulation advances in fixed SIM_HZ steps,
+        however long frames take; drawing interpolates between the last two
+        steps. After a hitch at most MAX_FRAME_TIME is caught up on. When
+        the scene is idle the scheduler lowers the frame rate.
+        """
+        step = 1.0 / SIM_HZ
+        # Idle frames are long on purpose; don't drop their time as a hitch.
+        max_frame_time = max(MAX_FRAME_TIME, 1.5 / IDLE_FPS)
+        accumulator = 0.0
+        last_time = time.perf_counter()
         while self.running:
-            now = time.time()
-            dt = now - self.last_time
-            self.last_time = now
+            now = time.perf_counter()
+            frame_time = min(now - last_time, max_frame_time)
+            last_time = now
+            accumulator += frame_time
 
-            for event in pygame.event.get():
+            for event in self.scheduler.events():
                 # --- The main loop ONLY handles events that close the game or resize the window ---
                 if event.type == pygame.QUIT:
                     self.running = False
@@ -63,37 +91,57 @@ class Game:
                 # --- All other events are passed to the current scene to handle ---
                 self.scene_manager.handle_event(event)
 
-            self.scene_manager.update(dt)
+            while accumulator >= step:
+                self.scene_manager.update(step)
+                accumulator -= step
+            sounds.update(frame_time)
             
+            # Take the FPS counter off first, so the scene doesn't have to repaint under it.
+            if self.fps_background:
+                self.screen.blit(self.fps_background, self.fps_rect)
+
             # This is now the single source of truth for drawing
-            dirty_rects = self.scene_manager.draw()
+            dirty_rects = self.scene_manager.draw(accumulator / step)
 
 
             # Code to display FPS ---
             fps_value = self.clock.get_fps()
-            fps_text = f"FPS: {fps_value:.1f}"
-            # Use red text if the FPS drops below 50
-            color = pygame.Color("white") if fps_value >= 50 else pygame.Color("red")
-            fps_surface = self.font.render(fps_text, True, color)
-            self.screen.blit(fps_surface, (10, 10))
+            idle = self.scheduler.is_idle
+            fps_text = f"FPS: {fps_value:.1f}{' (idle)' if idle else ''}  CPU: {self.scheduler.cpu_percent:.0f}%"
+            # Only re-render when the displayed value changes
+            if fps_text != self.fps_text:
+                self.fps_text = fps_text
+                # Use red text if the FPS drops below 50 (except on purpose, when idle)
+                color = WHITE if fps_value >= 50 or idle else pygame.Color("red")
+                self.fps_surface = fonts.render(self.font, fps_text, color)
+            fps_rect = self.fps_surface.get_rect(topleft=(10, 10)).clip(self.screen.get_rect())
+            self.fps_background = self.screen.subsurface(fps_rect).copy()
+            self.screen.blit(self.fps_surface, fps_rect)
+            # Also the old spot, in case the text got shorter
+            dirty_rects.append(fps_rect.union(self.fps_rect) if self.fps_rect else fps_rect)
+            self.fps_rect = fps_rect
 
             pygame.display.update(dirty_rects) 
-            
-            self.clock.tick(FPS)
+
+            scene = self.scene_manager.get_active_scene()
+            self.scheduler.frame_done(scene is not None and scene.is_idle() and not sounds.is_busy())
             
         # This code runs only AFTER the game loop has stopped
-        print("Game loop ended. Saving and quitting...")
+        stats = self.scheduler.stats()
+        logger.info("Game loop ended after %d frames (%d idle), %.1fs CPU in %.1fs. Saving and quitting...",
+                    stats["frames"], stats["idle_frames"], stats["cpu_seconds"], stats["wall_seconds"])
         
-        # Save cat data if we have any
-        if self.cat_data:
-            from core.save_manager import save_game
-            save_game(self.cat_data)
-            print("Game saved on exit!")
-        
-        # Also call on_quit on active scene for any other cleanup
+        # Let the active scene store its latest state and clean up first
         active_scene = self.scene_manager.get_active_scene()
         if active_scene and hasattr(active_scene, 'on_quit'):
             active_scene.on_quit()
+
+        # Save cat data if we have any, and wait for the background writer
+        if self.cat_data:
+            save_manager.save_game(self.cat_data)
+            save_manager.flush()
+            logger.info("Game saved on exit!")
+        save_manager.close()
             
         pygame.quit()
         sys.exit()
@@ -112,7 +160,7 @@ class Game:
             
             # Get actual fullscreen size for debugging
             actual_size = self.screen.get_size()
-            print(f"Switched to fullscreen: {actual_size[0]}x{actual_size[1]}")
+            logger.info("Switched to fullscreen: %dx%d", actual_size[0], actual_size[1])
             
         else:
             # Return to windowed mode
@@ -122,8 +170,11 @@ class Game:
             )
             pygame.display.set_caption(WINDOW_TITLE)
             self.fullscreen = False
-            print(f"Returned to windowed: {self.windowed_size}")
+            logger.info("Returned to windowed: %s", self.windowed_size)
+
+        self.scene_manager.dirty.mark_full()
 
 if __name__ == '__main__':
+    logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
     game = Game()
     game.run()
\ No newline at end of file
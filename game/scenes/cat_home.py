@@ -1,18 +1,25 @@
 # game/scenes/cat_home.py
 
+import logging
 import pygame
+import time
 from datetime import datetime
 
 from settings import *
 from core.sound_manager import sounds
-from core.ui import Button
+from core.ui import Button, StatHud
 from core.scene_manager import BaseScene
 from core.resource_manager import resources
+from core.font_manager import fonts
 from entities.cat import Cat
+from entities.components.stat_engine import stat_engine
 from core.draggable_item import DraggableItem
+from core.tiled_background import TiledBackground
 import core.save_manager as save_manager
 from scenes.wardrobe import WardrobeScene
 
+logger = logging.getLogger(__name__)
+
 class CatHomeScene(BaseScene):
     def __init__(self, scene_manager, game):
         super().__init__(scene_manager, game)
@@ -26,15 +33,14 @@ class CatHomeScene(BaseScene):
 
         self.time_of_day = "day"  # Default to day
         self.day_bg_original = resources.load_image("images/backgrounds/main.png")
-        try:
-            # Assumes you have 'main_night.jpg' in the same folder
+        if resources.exists("images/backgrounds/main_night.png"):
             self.night_bg_original = resources.load_image("images/backgrounds/main_night.png")
-        except FileNotFoundError:
-            print("Warning: 'main_night.jpg' not found. Using day background as fallback.")
+        else:
+            logger.warning("'main_night.png' not found. Using day background as fallback.")
             self.night_bg_original = self.day_bg_original # Fallback to day image
-        self.background_image = None # This will be set in _recalculate_layout
+        self.background = TiledBackground() # Scaled and tiled in _recalculate_layout
         self.time_update_interval = 60  # Check the clock every 60 seconds
-        self.time_update_timer = self.time_update_interval
+        self.timers.every(self.time_update_interval, self._update_time_of_day)
         
         self.cat_world_x = 0
         self.bed_world_x = 0
@@ -42,15 +48,46 @@ class CatHomeScene(BaseScene):
         self.bed_rect = None
         self.bed_image = None
 
+        self.food_replenish_delay = 1.0
+        # Saves run in the background and are skipped if nothing changed.
+        self.timers.every(AUTOSAVE_INTERVAL, self._autosave)
+
         self.paused = False
+        self._load_assets()
         self._recalculate_layout()
 
         self.is_chatting = False
         self.chat_input_text = ""
         self.chat_response_text = ""
-        self.chat_response_timer = 0.0
+        self.chat_response_timer = None
         self.chat_response_duration = 4.0
 
+    @classmethod
+    def asset_manifest(cls, game, data=None):
+        cat_data = data or game.cat_data or save_manager.load_cat(game.cat_id) or {}
+        return [
+            "images/backgrounds/main.png",
+            "images/backgrounds/main_night.png",
+            ("images/items/furniture/bed.png", 0.25),
+            ("images/items/food/001.png", 0.5),
+            ("images/ui_elements/mirror.png", 0.3),
+        ] + Cat.asset_manifest(cat_data)
+
+    def _load_assets(self):
+        """Loads the images and fonts that don't depend on the window size."""
+        try:
+            self.bed_image = resources.load_image("images/items/furniture/bed.png", scale=0.25)
+        except:
+            self.bed_image = pygame.Surface((400, 200), pygame.SRCALPHA); self.bed_image.fill((100, 50, 150, 0))
+            logger.warning("Bed image not found, using placeholder")
+
+        food_image = resources.load_image("images/items/food/001.png", scale=0.5)
+        self.food_item = DraggableItem(food_image, (0, 0))
+
+        self.hud_font = fonts.get_font(DEFAULT_FONT_NAME, 24)
+        self.chat_font = fonts.get_font(DEFAULT_FONT_NAME, 28)
+        self.mirror_image = resources.load_image("images/ui_elements/mirror.png", scale=0.3)
+
     def _recalculate_layout(self):
         current_width, current_height = self.game.screen.get_size()
         
@@ -59,34 +96,30 @@ class CatHomeScene(BaseScene):
         scaled_height = int(current_height * self.zoom_factor)
         scaled_width = int(scaled_height * aspect_ratio)
 
-        self.background_image = pygame.transform.smoothscale(active_original_bg, (scaled_width, scaled_height))
-        self.max_pan_x = max(0, self.background_image.get_width() - current_width)
-        max_pan_y = max(0, self.background_image.get_height() - current_height)
+        # Cached per (time of day, window size); new sizes start with a fast scale.
+        self.background.set_image((self.time_of_day, (current_width, current_height)), active_original_bg, (scaled_width, scaled_height))
+        self.max_pan_x = max(0, self.background.get_width() - current_width)
+        max_pan_y = max(0, self.background.get_height() - current_height)
 
         self.background_x = -self.max_pan_x / 2
         self.background_y = -min(self.background_y_offset, max_pan_y)
         
-        self.cat_world_x = self.background_image.get_width() / 2
+        self.cat_world_x = self.background.get_width() / 2
         
         # CRITICAL FIX: Set bed position using midbottom anchor for consistency.
-        self.bed_world_x = self.background_image.get_width() / 2 + 450
+        self.bed_world_x = self.background.get_width() / 2 + 450
         self.bed_world_y = current_height * 0.60
-        
-        try:
-            self.bed_image = resources.load_image("images/items/furniture/bed.png", scale=0.25)
-        except:
-            self.bed_image = pygame.Surface((400, 200), pygame.SRCALPHA); self.bed_image.fill((100, 50, 150, 0))
-            print("Warning: Bed image not found, using placeholder")
 
         # Update bed rect position based on current pan.
         self.bed_rect = self.bed_image.get_rect(center=(self.bed_world_x + self.background_x, self.bed_world_y))
         
-        food_image = resources.load_image("images/items/food/001.png", scale=0.5)
-        food_home_pos = (current_width - food_image.get_width() - 50, current_height - food_image.get_height() - 50)
-        self.food_item = DraggableItem(food_image, food_home_pos)
+        food_image = self.food_item.image
+        self.food_item.home_pos = (current_width - food_image.get_width() - 50, current_height - food_image.get_height() - 50)
+        if not self.food_item.is_dragging:
+            self.food_item.reset_position()
         
-        self.hud_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 24)
-        self.mirror_image = resources.load_image("images/ui_elements/mirror.png", scale=0.3)
+        self.hud = StatHud(self.hud_font)
+        if self.cat: self.hud.update(self._hud_bars())
         self.mirror_rect = self.mirror_image.get_rect(topleft=(20, 250))
         
         # Create the mute button and assign it to an instance variable
@@ -104,13 +137,9 @@ class CatHomeScene(BaseScene):
             Button(rect=(current_width - 90, button_y, 50, 50), text="+", callback=sounds.increase_volume)
         ]
         
-        self.chat_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 28)
         input_box_height = 40
         chat_box_width = 600
         self.chat_input_rect = pygame.Rect((current_width - chat_box_width) / 2, current_height - input_box_height - 10, chat_box_width, input_box_height)
-        
-        self.food_replenish_delay = 1.0
-        self.food_replenish_timer = 0.0
 
         if self.cat:
             self.cat.bed_world_x = self.bed_world_x + self.background_x
@@ -121,6 +150,9 @@ class CatHomeScene(BaseScene):
                 self.cat.set_position(new_cat_screen_x, cat_y_pos)
             else:
                 self.cat.set_position(self.bed_rect.centerx, self.bed_world_y)
+
+        # Everything moved or was rescaled, so repaint the whole window.
+        self.scene_manager.dirty.mark_full()
     
     def _update_time_of_day(self):
         """Checks the system clock and updates the background if the time of day has changed."""
@@ -129,15 +161,31 @@ class CatHomeScene(BaseScene):
 
         if new_time_of_day != self.time_of_day:
             self.time_of_day = new_time_of_day
-            print(f"Time of day changed to: {self.time_of_day}")
+            logger.info("Time of day changed to: %s", self.time_of_day)
             self._recalculate_layout() # Crucial: Reload and rescale the background
 
+    @staticmethod
+    def initial_cat(game, data=None):
+        """
+        The cat data to enter with and when it was saved. Only a cat loaded
+        from the save has a save time; a new cat has no time away to catch up on.
+        """
+        if data is not None:
+            # A new cat from customization
+            return data, None
+        if game.cat_data:
+            return game.cat_data, game.cat_saved_at
+        cat, saved_at = save_manager.load_cat_with_time(game.cat_id)
+        return cat or {}, saved_at
+
     def on_enter(self, data=None):
-        if not pygame.mixer.music.get_busy():
+        if not sounds.is_music_playing():
             sounds.play_music("music/background_music.ogg")
             
-        initial_data = data or self.game.cat_data or save_manager.load_game() or {}
+        initial_data, saved_at = self.initial_cat(self.game, data)
         self.game.cat_data = initial_data
+        # From here on the cat in memory is the current one.
+        self.game.cat_saved_at = None
 
         current_height = self.game.screen.get_size()[1]
         
@@ -145,23 +193,38 @@ class CatHomeScene(BaseScene):
         cat_y_pos = current_height * 0.63
         initial_cat_screen_x = self.cat_world_x + self.background_x
 
-        self.cat = Cat(position=(initial_cat_screen_x, cat_y_pos), initial_stats=initial_data, sleep_scale=0.25)
+        self.cat = Cat(position=(initial_cat_screen_x, cat_y_pos), initial_stats=initial_data, sleep_scale=0.25, timers=self.timers)
         
         self.cat.bed_world_x = self.bed_rect.centerx
         self.cat.bed_world_y = self.bed_world_y
+        if data is not None:
+            # A new game replaces the saved household.
+            save_manager.new_game(self.cat.to_dict())
 
         self._update_time_of_day()
 
         if initial_data.get("is_sleeping"):
             self.cat.start_sleeping(self.bed_rect.centerx, self.bed_world_y)
 
+        # Catch up on the time since the cat was saved, in one step.
+        if OFFLINE_PROGRESS and saved_at:
+            away = time.time() - saved_at
+            was_sleeping = self.cat.is_sleeping()
+            self.cat.catch_up(away)
+            # Woken outside update(), so move it off the bed here.
+            if was_sleeping and not self.cat.is_sleeping():
+                self.cat.set_position(initial_cat_screen_x, cat_y_pos)
+            logger.info("Caught up %.0f seconds away: %s", away, self.cat.stats.to_dict())
+
 
     def on_pause(self):
         self.paused = True
+        self.timers.pause()
     
     def on_resume(self):
         """Called when this scene becomes active again."""
         self.paused = False
+        self.timers.resume()
     
     def on_exit(self):
         """Called when leaving the scene, ensures the game is saved."""
@@ -176,7 +239,8 @@ class CatHomeScene(BaseScene):
                 if event.key == pygame.K_RETURN:
                     sounds.play_effect("effects/meow.wav")
                     self.chat_response_text = self.cat.get_chat_response(self.chat_input_text)
-                    self.chat_response_timer = self.chat_response_duration
+                    if self.chat_response_timer: self.chat_response_timer.cancel()
+                    self.chat_response_timer = self.timers.after(self.chat_response_duration, self._hide_chat_response)
                     self.is_chatting = False
                     self.chat_input_text = ""
                 elif event.key == pygame.K_BACKSPACE: self.chat_input_text = self.chat_input_text[:-1]
@@ -234,6 +298,7 @@ class CatHomeScene(BaseScene):
             if self.cat.collides_with_item(self.food_item):
                 self.cat.feed()
                 self.food_item.hide()
+                self.timers.after(self.food_replenish_delay, self._replenish_food)
                 sounds.play_effect("effects/eat.wav")
             else:
                 self.food_item.reset_position()
@@ -241,52 +306,81 @@ class CatHomeScene(BaseScene):
     def update(self, dt):
         if self.paused:
             return
-        if self.chat_response_timer > 0: self.chat_response_timer -= dt
         keys = pygame.key.get_pressed(); panned = False
         if keys[pygame.K_LEFT]: self.background_x += self.pan_speed * dt; panned = True
         if keys[pygame.K_RIGHT]: self.background_x -= self.pan_speed * dt; panned = True
         self.background_x = max(-self.max_pan_x, min(0, self.background_x))
         
         was_sleeping = self.cat.is_sleeping()
-        self.cat.update(dt)
+        # Stats for every cat in the scene are stepped together.
+        self.cat.update(dt, batched=True)
+        stat_engine.step(dt)
         just_woke_up = was_sleeping and not self.cat.is_sleeping()
         just_went_to_sleep = not was_sleeping and self.cat.is_sleeping()
 
-        if self.time_update_timer >= self.time_update_interval:
-            self.time_update_timer = 0
-            self._update_time_of_day()
-
         # If the cat just fell asleep, close the chat box.
         if just_went_to_sleep and self.is_chatting:
             self.is_chatting = False
             self.chat_input_text = ""
 
+        if panned or self.background.poll():
+            self.scene_manager.dirty.mark_full()
         if panned or just_woke_up:
             self.bed_rect.center = (self.bed_world_x + self.background_x, self.bed_world_y)
             self.cat.bed_world_x = self.bed_rect.centerx
             if self.cat.is_sleeping(): self.cat.set_position(self.bed_rect.centerx, self.bed_world_y)
             else: self.cat.set_position(self.cat_world_x + self.background_x, self.game.screen.get_height() * 0.63)
 
+        self.hud.update(self._hud_bars())
+
         self.food_item.update(dt)
         self.cat.set_food_hover(self.food_item.is_dragging and self.cat.collides_with_item(self.food_item))
-        if not self.food_item.visible:
-            self.food_replenish_timer += dt
-            if self.food_replenish_timer >= self.food_replenish_delay: self.food_item.show(); self.food_item.reset_position(); self.food_replenish_timer = 0.0
+
+    def is_idle(self):
+        """True while the cat sleeps and nothing is animating, counting down or held down."""
+        keys = pygame.key.get_pressed()
+        return (self.cat.is_sleeping() and not self.cat.interactions.is_being_petted
+                and not self.is_chatting and not self.chat_response_text
+                and not self.food_item.is_dragging and not (keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]))
+
+    def interpolate(self, alpha):
+        self.cat.interpolate(alpha)
+
+    def report_dirty(self, dirty):
+        """Reports everything that changed since the last frame."""
+        self.cat.report_dirty(dirty)
+        self.food_item.report_dirty(dirty)
+        for button in self.volume_buttons: button.report_dirty(dirty)
+        dirty.track("hud", self.hud.rect, self.hud.rebuild_count)
+        dirty.track("chat_response", self._chat_response_rect() if self.chat_response_text else None, self.chat_response_text)
+        dirty.track("chat_input", self.chat_input_rect if self.is_chatting else None, self.chat_input_text)
 
     def draw(self, screen):
-        # --- RENDER FIX: This simple full redraw prevents all disappearing bugs ---
-        screen.blit(self.background_image, (self.background_x, self.background_y))
+        # Full scene draw; SceneManager clips it to the dirty regions, which also
+        # restores the background under anything that moved.
+        self.background.draw(screen, (self.background_x, self.background_y))
         if self.bed_image: screen.blit(self.bed_image, self.bed_rect)
         self.cat.draw(screen)
         self.food_item.draw(screen)
         screen.blit(self.mirror_image, self.mirror_rect)
-        self._draw_hud(screen)
+        self.hud.draw(screen)
         for button in self.volume_buttons: button.draw(screen)
         self._draw_chat_ui(screen)
-        return [screen.get_rect()]
     
     # --- Helper methods below ---
 
+    def _autosave(self):
+        if self.cat:
+            self.game.cat_data = self.cat.to_dict()
+            save_manager.save_game(self.game.cat_data)
+
+    def _hide_chat_response(self):
+        self.chat_response_text = ""
+
+    def _replenish_food(self):
+        self.food_item.show()
+        self.food_item.reset_position()
+
     def handle_bed_click(self, mouse_pos):
         if self.bed_rect and self.bed_rect.collidepoint(mouse_pos) and self.cat and self.cat.can_sleep():
             self.cat.start_sleeping(self.bed_rect.centerx, self.bed_world_y)
@@ -300,35 +394,25 @@ class CatHomeScene(BaseScene):
             return True
         return False
         
-    def _draw_hud(self, screen):
-        # Happiness Bar
-        hap_text = self.hud_font.render("Happiness", True, WHITE)
-        screen.blit(hap_text, (20, 20))
-        pygame.draw.rect(screen, (50, 50, 50), (20, 50, 200, 25))
-        hap_width = (self.cat.happiness / MAX_STAT_VALUE) * 200
-        pygame.draw.rect(screen, (50, 200, 50), (20, 50, hap_width, 25))
-        pygame.draw.rect(screen, WHITE, (20, 50, 200, 25), 2)
-        
-        # Hunger Bar
-        hun_text = self.hud_font.render("Hunger", True, WHITE)
-        screen.blit(hun_text, (20, 90))
-        pygame.draw.rect(screen, (50, 50, 50), (20, 120, 200, 25))
-        hun_width = (self.cat.hunger / MAX_STAT_VALUE) * 200
-        pygame.draw.rect(screen, (200, 150, 50), (20, 120, hun_width, 25))
-        pygame.draw.rect(screen, WHITE, (20, 120, 200, 25), 2)
-        
-        # Energy Bar
-        energy_text = self.hud_font.render("Energy", True, WHITE)
-        screen.blit(energy_text, (20, 160))
-        pygame.draw.rect(screen, (50, 50, 50), (20, 190, 200, 25))
-        energy_width = (self.cat.energy / MAX_STAT_VALUE) * 200
+    def _hud_bars(self):
+        """The stat bars shown in the HUD, as (label, value, max_value, color)."""
         energy_color = (50, 150, 200) if self.cat.energy > 50 else (200, 100, 50)
-        pygame.draw.rect(screen, energy_color, (20, 190, energy_width, 25))
-        pygame.draw.rect(screen, WHITE, (20, 190, 200, 25), 2)
-    
+        return [
+            ("Happiness", self.cat.happiness, MAX_STAT_VALUE, (50, 200, 50)),
+            ("Hunger", self.cat.hunger, MAX_STAT_VALUE, (200, 150, 50)),
+            ("Energy", self.cat.energy, MAX_STAT_VALUE, energy_color),
+        ]
+
+    def _chat_response_rect(self):
+        """The screen area of the chat bubble, including its padding."""
+        width, height = self.chat_font.size(self.chat_response_text)
+        response_rect = pygame.Rect(0, 0, width, height)
+        response_rect.midbottom = (self.cat.rect.centerx, self.cat.rect.top - 10)
+        return response_rect.inflate(10, 10)
+
     def _draw_chat_ui(self, screen):
-        if self.chat_response_timer > 0 and self.chat_response_text:
-            response_surf = self.chat_font.render(self.chat_response_text, True, BLACK, (255, 255, 255, 200))
+        if self.chat_response_text:
+            response_surf = fonts.render(self.chat_font, self.chat_response_text, BLACK, (255, 255, 255, 200))
             response_rect = response_surf.get_rect(midbottom=(self.cat.rect.centerx, self.cat.rect.top - 10))
             pygame.draw.rect(screen, (255, 255, 255, 200), response_rect.inflate(10, 10), border_radius=8)
             screen.blit(response_surf, response_rect)
@@ -336,13 +420,14 @@ class CatHomeScene(BaseScene):
         if self.is_chatting:
             pygame.draw.rect(screen, WHITE, self.chat_input_rect, border_radius=5)
             pygame.draw.rect(screen, BLACK, self.chat_input_rect, 2, border_radius=5)
-            screen.blit(self.chat_font.render(self.chat_input_text, True, BLACK), (self.chat_input_rect.x + 10, self.chat_input_rect.y + 5))
+            screen.blit(fonts.render(self.chat_font, self.chat_input_text, BLACK), (self.chat_input_rect.x + 10, self.chat_input_rect.y + 5))
         
     def on_quit(self):
-        if self.cat: save_manager.save_game(self.cat.to_dict())
+        # Game.run saves game.cat_data after this; an identical save is skipped.
+        if self.cat:
+            self.game.cat_data = self.cat.to_dict()
+            save_manager.save_game(self.game.cat_data)
     
     def toggle_mute_text(self):
         sounds.toggle_mute()
-        self.mute_button.text = "Unmute" if sounds.is_muted else "Mute"
-        self.mute_button.text_surf = self.mute_button.font.render(self.mute_button.text, True, self.mute_button.text_color)
-        self.mute_button.text_rect = self.mute_button.text_surf.get_rect(center=self.mute_button.rect.center)
\ No newline at end of file
+        self.mute_button.set_text("Unmute" if sounds.is_muted else "Mute")
\ No newline at end of file
@@ -1,10 +1,12 @@
 # game/scenes/customization.py
 
 import pygame
+import uuid
 
 from settings import *
 from core.scene_manager import BaseScene
 from core.ui import Button
+from core.font_manager import fonts
 from scenes.cat_home import CatHomeScene
 from entities.cat import Cat
 
@@ -24,7 +26,7 @@ class CatCustomizationScene(BaseScene):
         }
         
         # Create the cat instance that we will show on screen
-        self.cat_preview = Cat((self.game.screen.get_width() / 2, self.game.screen.get_height() / 2), {"customization": self.cat_data})
+        self.cat_preview = Cat((self.game.screen.get_width() / 2, self.game.screen.get_height() / 2), {"customization": self.cat_data}, timers=self.timers)
         
         # Pre-defined color palettes
         self.palettes = {
@@ -36,12 +38,16 @@ class CatCustomizationScene(BaseScene):
         self.current_selection = "base" # Tracks which category is being edited
         self._recalculate_layout()
 
+    @classmethod
+    def asset_manifest(cls, game, data=None):
+        return Cat.asset_manifest({"customization": {"body_type": "shorthair"}})
+
     def _recalculate_layout(self):
         """Creates and positions all UI elements based on the current screen size."""
         current_width, current_height = self.game.screen.get_size()
         
-        self.title_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 72)
-        self.title_surf = self.title_font.render("Create Your Cat", True, BLACK)
+        self.title_font = fonts.get_font(DEFAULT_FONT_NAME, 72)
+        self.title_surf = fonts.render(self.title_font, "Create Your Cat", BLACK)
         self.title_rect = self.title_surf.get_rect(center=(current_width / 2, 100))
 
         # --- Category Buttons ---
@@ -63,7 +69,7 @@ class CatCustomizationScene(BaseScene):
             
             if color is None: # Special case for "None" button
                 btn.color_normal = (50, 50, 50)
-                btn.text_surf = pygame.font.SysFont(DEFAULT_FONT_NAME, 30).render("X", True, WHITE)
+                btn.text_surf = fonts.render(fonts.get_font(DEFAULT_FONT_NAME, 30), "X", WHITE)
                 btn.text_rect = btn.text_surf.get_rect(center=btn.rect.center)
             else:
                 btn.color_normal = color
@@ -74,6 +80,9 @@ class CatCustomizationScene(BaseScene):
         # --- Confirm Button ---
         self.confirm_button = Button(rect=(current_width - 250, current_height - 100, 200, 50), text="Confirm", callback=self._on_confirm)
 
+        # The buttons were rebuilt, so repaint the whole window.
+        self.scene_manager.dirty.mark_full()
+
     def set_selection(self, selection):
         """Changes the active category and rebuilds the color palette."""
         self.current_selection = selection
@@ -104,16 +113,26 @@ class CatCustomizationScene(BaseScene):
     def update(self, dt):
         self.cat_preview.update(dt)
 
+    def report_dirty(self, dirty):
+        self.cat_preview.report_dirty(dirty)
+        for btn in self.category_buttons + self.color_buttons + [self.confirm_button]:
+            btn.report_dirty(dirty)
+
     def draw(self, screen):
         screen.fill(BACKGROUND_COLOR)
         screen.blit(self.title_surf, self.title_rect)
         self.cat_preview.draw(screen)
         for btn in self.category_buttons + self.color_buttons + [self.confirm_button]:
             btn.draw(screen)
-        return [screen.get_rect()]
 
     def _on_confirm(self):
         """Finalizes the cat and moves to the main game scene, passing data directly."""
-        final_cat_data = {"customization": self.cat_data}
+        # Stats go at the top level, where CatStats reads them; only the look is customization.
+        stats = ("hunger", "happiness", "energy")
+        final_cat_data = {key: self.cat_data[key] for key in stats}
+        final_cat_data["customization"] = {key: value for key, value in self.cat_data.items() if key not in stats}
+        # Its own id, so it is never mistaken for a cat from an older save
+        final_cat_data["cat_id"] = uuid.uuid4().hex
+        self.game.cat_id = final_cat_data["cat_id"]
         # We no longer set self.game.cat_data here. We pass it directly.
-        self.scene_manager.set_scene(CatHomeScene, data=final_cat_data)
\ No newline at end of file
+        self.scene_manager.load_scene(CatHomeScene, data=final_cat_data)
\ No newline at end of file
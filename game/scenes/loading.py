@@ -0,0 +1,58 @@
+# game/scenes/loading.py
+
+import pygame
+
+from settings import *
+from core.scene_manager import BaseScene
+from core.resource_manager import resources
+from core.font_manager import fonts
+
+class LoadingScene(BaseScene):
+    """
+    Shows a progress bar while another scene's assets are decoded in the
+    background, then switches to that scene. Use SceneManager.load_scene.
+    """
+    def __init__(self, scene_manager, game):
+        super().__init__(scene_manager, game)
+
+        self.font = fonts.get_font(DEFAULT_FONT_NAME, 36)
+        self.title_surf = fonts.render(self.font, "Loading...", BLACK)
+        self.bar_size = (400, 30)
+
+        self.next_scene = None
+        self.next_data = None
+        self.job = None
+
+    @classmethod
+    def asset_manifest(cls, game, data=None):
+        # Pinning the next scene's images keeps early ones cached while later ones load.
+        return data[2]
+
+    def on_enter(self, data=None):
+        self.next_scene, self.next_data, manifest = data
+        self.job = resources.preload(manifest)
+
+    def update(self, dt):
+        # Converting to the display format has to happen here on the main thread;
+        # the budget keeps the bar moving while big images are finished.
+        self.job.poll(LOADING_FRAME_BUDGET)
+        if self.job.finished:
+            self.scene_manager.set_scene(self.next_scene, self.next_data)
+
+    def _bar_rect(self, screen):
+        rect = pygame.Rect((0, 0), self.bar_size)
+        rect.center = (screen.get_width() / 2, screen.get_height() / 2 + 40)
+        return rect
+
+    def report_dirty(self, dirty):
+        dirty.track(self, self._bar_rect(self.game.screen).inflate(4, 4), self.job.done)
+
+    def draw(self, screen):
+        screen.fill(BACKGROUND_COLOR)
+        screen.blit(self.title_surf, self.title_surf.get_rect(center=(screen.get_width() / 2, screen.get_height() / 2 - 20)))
+
+        bar_rect = self._bar_rect(screen)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * self.job.progress)
+        pygame.draw.rect(screen, (100, 100, 120), fill_rect)
+        pygame.draw.rect(screen, BLACK, bar_rect, 2)
@@ -1,10 +1,12 @@
 # game/scenes/menu.py
 
 import pygame
+import time
 
 from settings import *
 from core.scene_manager import BaseScene
 from core.ui import Button
+from core.font_manager import fonts
 from scenes.cat_home import CatHomeScene
 from scenes.customization import CatCustomizationScene # <-- Import new scene
 import core.save_manager as save_manager # <-- Import save manager
@@ -16,8 +18,8 @@ class MenuScene(BaseScene):
         # Get current screen dimensions
         current_width, current_height = self.game.screen.get_size()
         
-        self.title_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 72)
-        self.title_surf = self.title_font.render(WINDOW_TITLE, True, BLACK)
+        self.title_font = fonts.get_font(DEFAULT_FONT_NAME, 72)
+        self.title_surf = fonts.render(self.title_font, WINDOW_TITLE, BLACK)
         self.title_rect = self.title_surf.get_rect(center=(current_width / 2, current_height * 0.2)) # <-- CORRECTED
         
         # --- Dynamic Button Creation ---
@@ -27,8 +29,15 @@ class MenuScene(BaseScene):
         button_y_start = current_height * 0.4 # <-- CORRECTED
         button_spacing = 70
 
-        # Check if a save file exists
-        self.save_exists = save_manager.load_game() is not None
+        # Check if a save file exists (reads the save's index, not the cats)
+        self.save_info = save_manager.probe()
+        self.save_exists = self.save_info is not None
+        self.save_surf = None
+        if self.save_exists:
+            names = ", ".join(self.save_info.names)
+            last_played = time.strftime("%b %d, %H:%M", time.localtime(self.save_info.last_played))
+            self.save_surf = fonts.render(fonts.get_font(DEFAULT_FONT_NAME, 28), f"{names} - last played {last_played}", BLACK)
+            self.save_rect = self.save_surf.get_rect(center=(current_width / 2, current_height * 0.3))
         
         if self.save_exists:
             # Show Continue and New Game
@@ -54,21 +63,30 @@ class MenuScene(BaseScene):
         for button in self.buttons:
             button.handle_event(event)
 
+    def is_idle(self):
+        # Buttons only change on input.
+        return True
+
+    def report_dirty(self, dirty):
+        for button in self.buttons:
+            button.report_dirty(dirty)
+
     def draw(self, screen):
         screen.fill(BACKGROUND_COLOR)
         screen.blit(self.title_surf, self.title_rect)
+        if self.save_surf:
+            screen.blit(self.save_surf, self.save_rect)
         for button in self.buttons:
             button.draw(screen)
-        return [screen.get_rect()]
 
     def _on_continue_clicked(self):
-        # Load game data from save file and go to home scene
-        self.game.cat_data = save_manager.load_game()
-        self.scene_manager.set_scene(CatHomeScene)
+        # Load game data (the save parsed for the menu is reused) and go to home scene
+        self.game.cat_data, self.game.cat_saved_at = save_manager.load_cat_with_time(self.game.cat_id)
+        self.scene_manager.load_scene(CatHomeScene)
 
     def _on_new_game_clicked(self):
         # Go to the customization scene
-        self.scene_manager.set_scene(CatCustomizationScene)
+        self.scene_manager.load_scene(CatCustomizationScene)
 
     def _on_exit_clicked(self):
         pygame.event.post(pygame.event.Event(pygame.QUIT))
\ No newline at end of file
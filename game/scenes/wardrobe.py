@@ -1,13 +1,17 @@
 # game/scenes/wardrobe.py
 
+import logging
 import pygame
 import copy
 from settings import *
 from core.scene_manager import BaseScene
 from core.ui import Button
+from core.font_manager import fonts
 from core.resource_manager import resources
 from entities.cat import Cat
 
+logger = logging.getLogger(__name__)
+
 class WardrobeScene(BaseScene):
     """
     Scene for trying on and managing cat accessories.
@@ -35,14 +39,19 @@ class WardrobeScene(BaseScene):
         # UI state
         self.cat_preview = None
         self.original_cat_data = None
+
+        # The scene underneath, dimmed once into a backdrop we redraw from
+        self.underlying_scene = self.scene_manager.get_active_scene()
+        self.backdrop = None
         
         self._setup_ui()
 
     def _setup_ui(self):
         """Initialize UI elements that don't depend on screen size."""
-        self.title_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 52)
-        self.category_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 36)
-        self.item_font = pygame.font.SysFont(DEFAULT_FONT_NAME, 28)
+        self.title_font = fonts.get_font(DEFAULT_FONT_NAME, 52)
+        self.category_font = fonts.get_font(DEFAULT_FONT_NAME, 36)
+        self.item_font = fonts.get_font(DEFAULT_FONT_NAME, 28)
+        self.instruction_font = fonts.get_font(DEFAULT_FONT_NAME, 18)
         self._recalculate_layout()
 
     def _recalculate_layout(self):
@@ -50,7 +59,7 @@ class WardrobeScene(BaseScene):
         current_width, current_height = self.game.screen.get_size()
         
         # Title
-        self.title_surf = self.title_font.render("Wardrobe", True, WHITE)
+        self.title_surf = fonts.render(self.title_font, "Wardrobe", WHITE)
         self.title_rect = self.title_surf.get_rect(center=(current_width / 2, 60))
         
         # Category selection buttons
@@ -104,6 +113,19 @@ class WardrobeScene(BaseScene):
             callback=self._cancel_changes
         )
 
+        # The buttons were rebuilt, so repaint the whole window.
+        self.scene_manager.dirty.mark_full()
+
+    def _build_backdrop(self, size):
+        """Renders the scene underneath once, with the dark overlay on top."""
+        self.backdrop = pygame.Surface(size)
+        if self.underlying_scene:
+            self.underlying_scene.draw(self.backdrop)
+        # Semi-transparent background overlay
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill((20, 30, 50, 200))  # Dark blue overlay
+        self.backdrop.blit(overlay, (0, 0))
+
     def on_enter(self, data=None):
         """Called when entering the wardrobe scene."""
         if not data:
@@ -119,7 +141,8 @@ class WardrobeScene(BaseScene):
         self.cat_preview = Cat(
             position=cat_pos,
             initial_stats=data,
-            scale=0.7  # Larger scale for better visibility when trying on clothes
+            scale=0.7,  # Larger scale for better visibility when trying on clothes
+            timers=self.timers
         )
         
         # Set current indices based on cat's current accessories
@@ -168,12 +191,20 @@ class WardrobeScene(BaseScene):
         if self.cat_preview:
             self.cat_preview.update(dt, update_stats=False)
 
+    def report_dirty(self, dirty):
+        """Reports the preview, buttons and labels that changed."""
+        for btn in self.category_buttons + [self.prev_button, self.next_button, self.remove_button,
+                                            self.save_exit_button, self.cancel_button]:
+            btn.report_dirty(dirty)
+        if self.cat_preview:
+            self.cat_preview.report_dirty(dirty)
+        dirty.track("labels", (250, 130, 500, 110), (self.current_category, self.current_indices[self.current_category]))
+
     def draw(self, screen):
         """Render the wardrobe scene."""
-        # Semi-transparent background overlay
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((20, 30, 50, 200))  # Dark blue overlay
-        screen.blit(overlay, (0, 0))
+        if self.backdrop is None or self.backdrop.get_size() != screen.get_size():
+            self._build_backdrop(screen.get_size())
+        screen.blit(self.backdrop, (0, 0))
         
         # Title
         screen.blit(self.title_surf, self.title_rect)
@@ -183,7 +214,7 @@ class WardrobeScene(BaseScene):
             btn.draw(screen)
         
         # Current category label
-        category_label = self.category_font.render(f"Category: {self.current_category.title()}", True, WHITE)
+        category_label = fonts.render(self.category_font, f"Category: {self.current_category.title()}", WHITE)
         screen.blit(category_label, (250, 130))
         
         # Current item display
@@ -193,12 +224,12 @@ class WardrobeScene(BaseScene):
             current_item = current_items[current_index]
             
             item_text = f"Item: {current_item}" if current_item != "None" else "Item: None"
-            item_label = self.item_font.render(item_text, True, WHITE)
+            item_label = fonts.render(self.item_font, item_text, WHITE)
             screen.blit(item_label, (250, 180))
             
             # Item counter
             counter_text = f"{current_index + 1} / {len(current_items)}"
-            counter_label = self.item_font.render(counter_text, True, (200, 200, 200))
+            counter_label = fonts.render(self.item_font, counter_text, (200, 200, 200))
             screen.blit(counter_label, (250, 210))
         
         # Navigation buttons
@@ -224,11 +255,9 @@ class WardrobeScene(BaseScene):
         ]
         
         for i, instruction in enumerate(instructions):
-            inst_surf = pygame.font.SysFont(DEFAULT_FONT_NAME, 18).render(instruction, True, (180, 180, 180))
+            inst_surf = fonts.render(self.instruction_font, instruction, (180, 180, 180))
             screen.blit(inst_surf, (50, screen.get_height() - 120 + i * 20))
 
-        return [screen.get_rect()]
-
     def _select_category(self, category):
         """Switch to a different accessory category."""
         self.current_category = category
@@ -304,7 +333,7 @@ class WardrobeScene(BaseScene):
                 # Equip the accessory
                 self.cat_preview.accessories[self.current_category] = selected_item
             
-            print(f"Trying on: {selected_item} in category {self.current_category}")
+            logger.debug("Trying on: %s in category %s", selected_item, self.current_category)
 
     def _remove_current_item(self):
         """Remove the current category's accessory."""
@@ -316,14 +345,14 @@ class WardrobeScene(BaseScene):
             del self.cat_preview.data.accessories[self.current_category]
         
         self.current_indices[self.current_category] = 0
-        print(f"Removed accessory from category: {self.current_category}")
+        logger.debug("Removed accessory from category: %s", self.current_category)
 
     def _save_and_exit(self):
         """Save changes and return to cat home."""
         if self.cat_preview:
             # Update the game's cat data with new accessories
             self.game.cat_data = self.cat_preview.to_dict()
-            print("Wardrobe changes saved!")
+            logger.info("Wardrobe changes saved!")
         
         self.scene_manager.pop()
 
@@ -345,5 +374,5 @@ class WardrobeScene(BaseScene):
                     else:
                         self.current_indices[category] = 0
         
-        print("Wardrobe changes cancelled.")
+        logger.info("Wardrobe changes cancelled.")
         self.scene_manager.pop()
\ No newline at end of file
@@ -6,6 +6,10 @@ from pathlib import Path
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
+SIM_HZ = 60 # Fixed simulation steps per second, independent of the frame rate
+MAX_FRAME_TIME = 0.25 # Most seconds of simulation one frame catches up on after a hitch; the rest is dropped
+IDLE_FPS = 5 # Frame rate while the scene reports nothing is happening (input wakes it at once)
+IDLE_DELAY = 2.0 # Seconds of idle frames before dropping to IDLE_FPS
 WINDOW_TITLE = "Cat Friends"
 
 # Color Palette (can be expanded later)
@@ -22,6 +26,52 @@ FREDOKA_FONT_PATH = FONTS_PATH / "FredokaOne-Regular.ttf"
 DEFAULT_FONT_NAME = "fredokaoneregular"
 DEFAULT_FONT_SIZE = 32
 
+# Logging: "DEBUG" also shows every asset load and cat interaction
+LOG_LEVEL = "INFO"
+
+# Rendering caches
+SPRITE_CACHE_SIZE = 64 # Finished cat sprites kept per cat (frames x face states)
+COMPOSITOR = "blend" # How cat layers are combined: "blend" (pygame blits) or "numpy"
+TEXT_CACHE_SIZE = 256 # Rendered text surfaces shared by all scenes
+BACKGROUND_TILE_SIZE = 256 # Side of a background tile in pixels
+BACKGROUND_CACHE_SIZE = 4 # Scaled backgrounds kept per (time of day, window size)
+
+# Asset loading
+LOADER_THREADS = 4 # Threads decoding images for preload manifests
+LOADING_FRAME_BUDGET = 0.008 # Seconds per frame the loading screen spends converting images
+IMAGE_CACHE_BUDGET_MB = 256 # Loaded images kept in memory; images pinned by open scenes may exceed it
+IMAGE_DISK_CACHE = True # Keep decoded, scaled images in cache/images for faster launches
+
+# Packed sprite sheets (see tools/pack_sprites.py)
+SHEET_INDEX_NAME = "sheet.json"
+SHEET_IMAGE_NAME = "sheet.png"
+SHEET_MAX_WIDTH = 2048
+
+# Sound
+AUDIO_DRIVER = None # SDL audio driver to use unless SDL_AUDIODRIVER is set, e.g. "dummy" for headless runs
+MUSIC_CROSSFADE = 1.5 # Seconds to fade between music tracks
+EFFECT_CHANNELS = 8 # Mixer channels shared by all sound effects
+# voices: how many copies may overlap, priority: higher can interrupt lower
+# when all channels are busy, cooldown: seconds before the effect can replay
+SOUND_EFFECT_RULES = {
+    "effects/purr.wav": {"voices": 1, "priority": 1, "cooldown": 0.5},
+    "effects/poke.wav": {"voices": 2, "priority": 2, "cooldown": 0.1},
+    "effects/meow.wav": {"voices": 1, "priority": 2, "cooldown": 0.3},
+    "effects/eat.wav": {"voices": 1, "priority": 2, "cooldown": 0.2},
+    "effects/button_slash.wav": {"voices": 2, "priority": 0, "cooldown": 0.05},
+}
+DEFAULT_SOUND_EFFECT_RULE = {"voices": 2, "priority": 1, "cooldown": 0.05}
+
+# Saving
+SAVE_FORMAT = "binary" # "binary" (compact, saves/savegame.dat) or "json" (readable, saves/savegame.json)
+SAVE_BACKEND = "file" # "file" (one save file, see SAVE_FORMAT) or "sqlite" (saves/saves.db, one row per cat)
+SAVE_SLOT = 0 # Which household in saves.db to play (sqlite backend only)
+STAT_HISTORY_LIMIT = 1000 # Stat snapshots kept per cat in saves.db, newest first (one per changed save)
+AUTOSAVE_INTERVAL = 30.0 # Seconds between autosaves in the cat's home (skipped if nothing changed)
+
+OFFLINE_PROGRESS = True # Stats keep changing (and the cat naps) while the game is closed
+STAT_ENGINE_NUMPY_ROWS = 16 # Cats at which stats move to the NumPy engine; fewer are faster in plain Python
+
 MAX_STAT_VALUE = 100.0
 
 # Values are in points-per-second
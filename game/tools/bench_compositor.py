@@ -0,0 +1,81 @@
+# game/tools/bench_compositor.py
+"""
+Checks that the blend and NumPy compositors produce the same cat sprites,
+then times how long each takes to compose every sprite variant.
+
+Run from the game directory:
+    python -m tools.bench_compositor --body-type shorthair --rounds 20
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from entities.components.cat_rendering import CatRenderer
+
+CUSTOMIZATION = {
+    "base_color": (230, 210, 190),
+    "pattern_color": (90, 70, 50),
+    "eye_color": (87, 255, 250),
+    "nose_color": (255, 180, 200),
+}
+
+def variants(renderer):
+    """Every (frame, eyes closed, food hover) combination, plus sleeping."""
+    frames = renderer.layers["base"]["idle"]
+    for frame, eyes_closed, food in itertools.product(frames, (False, True), (False, True)):
+        yield frame, eyes_closed, food, False
+    yield frames[0], False, False, True
+
+def compose_all(renderer):
+    """Composes every variant from scratch and returns the surfaces."""
+    images = []
+    for frame, eyes_closed, food, sleeping in variants(renderer):
+        renderer.sprite_cache.clear()
+        images.append(renderer.compose_image(frame, eyes_closed, False, food, sleeping).image)
+    return images
+
+def max_difference(first, second):
+    """Largest per-channel difference between two equally sized surfaces."""
+    a = pygame.surfarray.array3d(first).astype(int) - pygame.surfarray.array3d(second)
+    b = pygame.surfarray.array_alpha(first).astype(int) - pygame.surfarray.array_alpha(second)
+    return max(abs(a).max(), abs(b).max())
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare and time the cat compositors.")
+    parser.add_argument("--body-type", default="shorthair")
+    parser.add_argument("--scale", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--tolerance", type=int, default=1, help="Allowed per-channel difference")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    renderer = CatRenderer(dict(CUSTOMIZATION), args.body_type, args.scale)
+
+    results = {}
+    for name in ("blend", "numpy"):
+        renderer.set_compositor(name)
+        if renderer.compositor != name:
+            continue
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            images = compose_all(renderer)
+        elapsed = time.perf_counter() - start
+        results[name] = images
+        per_sprite = elapsed / (args.rounds * len(images)) * 1000
+        print(f"{name:>6}: {per_sprite:.3f} ms per sprite ({len(images)} variants x {args.rounds} rounds)")
+
+    if len(results) == 2:
+        worst = max(max_difference(a, b) for a, b in zip(results["blend"], results["numpy"]))
+        print(f"Largest per-channel difference: {worst}")
+        if worst > args.tolerance:
+            raise SystemExit(f"Compositors differ by more than {args.tolerance}")
+
+if __name__ == "__main__":
+    main()
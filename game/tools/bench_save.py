@@ -0,0 +1,84 @@
+# game/tools/bench_save.py
+"""
+Round-trips a household of made-up cats through the old pretty-printed
+JSON save, the versioned JSON save and the binary save, checks that the
+cats come back intact, and reports file sizes and encode/decode times.
+
+Run from the game directory:
+    python -m tools.bench_save --cats 1 100 1000 --rounds 50
+"""
+
+import argparse
+import json
+import random
+import time
+
+from core import save_format
+
+ACCESSORIES = {"head": ["hat1", "hat2"], "body": ["scarf", "collar"], "accessories": ["bow"]}
+
+def make_cat(i, rng):
+    """A cat dict shaped like Cat.to_dict()."""
+    return {
+        "cat_id": f"cat_{i}",
+        "name": rng.choice(["kitty", "mochi", "biscuit", "tofu"]),
+        "hunger": rng.uniform(0, 100),
+        "happiness": rng.uniform(0, 100),
+        "energy": rng.uniform(0, 100),
+        "accessories": {slot: rng.choice(items) for slot, items in ACCESSORIES.items() if rng.random() < 0.5},
+        "customization": {
+            "body_type": "shorthair",
+            "base_color": [rng.randrange(256) for _ in range(3)],
+            "pattern_color": [rng.randrange(256) for _ in range(3)] if rng.random() < 0.8 else None,
+            "eye_color": [rng.randrange(256) for _ in range(3)],
+            "nose_color": [255, 180, 200],
+        },
+        "is_sleeping": rng.random() < 0.3,
+    }
+
+def legacy_json(cat):
+    """The old save: one cat, pretty-printed, stats repeated in customization."""
+    legacy = dict(cat)
+    legacy["customization"] = dict(cat["customization"], hunger=100.0, happiness=70.0, energy=100.0)
+    return json.dumps(legacy, indent=4).encode("utf-8")
+
+def same_cat(expected, actual):
+    """Stats are stored as float32, so compare them loosely."""
+    for key in ("hunger", "happiness", "energy"):
+        if abs(expected[key] - actual[key]) > 1e-3:
+            return False
+    strip = lambda cat: {k: v for k, v in cat.items() if k not in ("hunger", "happiness", "energy")}
+    return strip(expected) == strip(actual)
+
+def timed(function, rounds):
+    """Average milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = function()
+    return (time.perf_counter() - start) * 1000 / rounds, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare save formats by size and speed.")
+    parser.add_argument("--cats", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    cat = make_cat(0, rng)
+    migrated = save_format.decode(legacy_json(cat)).cat(0)
+    assert migrated == cat, "legacy JSON did not migrate to the same cat"
+    print(f"legacy single-cat JSON: {len(legacy_json(cat))} bytes, migrates cleanly")
+
+    print(f"{'cats':>6} {'format':>7} {'bytes':>9} {'encode ms':>10} {'decode ms':>10} {'one cat ms':>11}")
+    for count in args.cats:
+        cats = [make_cat(i, rng) for i in range(count)]
+        for name, encode in (("json", save_format.encode_json), ("binary", save_format.encode)):
+            encode_ms, data = timed(lambda: encode(cats), args.rounds)
+            decode_ms, save = timed(lambda: save_format.decode(data).cats(), args.rounds)
+            # Lazy loading: open the save and read only the last cat.
+            one_ms, last = timed(lambda: save_format.decode(data).cat(count - 1), args.rounds)
+            assert all(same_cat(a, b) for a, b in zip(cats, save)) and same_cat(cats[-1], last), f"{name} round trip changed a cat"
+            print(f"{count:>6} {name:>7} {len(data):>9} {encode_ms:>10.3f} {decode_ms:>10.3f} {one_ms:>11.3f}")
+
+if __name__ == "__main__":
+    main()
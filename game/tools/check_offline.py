@@ -0,0 +1,139 @@
+# game/tools/check_offline.py
+"""
+Checks that CatStats.advance (closed-form offline progression) ends where
+ticking the stats frame by frame would, across sleep/wake crossings and
+clamping, and times both. Also checks which cats get caught up: a cat
+continued from the save does, a new game started over an old save doesn't.
+
+Run from the game directory:
+    python -m tools.check_offline            # scenarios up to a few hours
+    python -m tools.check_offline --days 3   # adds a long run (slow tick path)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import types
+import uuid
+from pathlib import Path
+
+import core.save_manager as save_manager
+from entities.components.cat_stats import CatStats
+from settings import ENERGY_DECAY_RATE, ENERGY_REPLENISH_RATE, SIM_HZ
+
+# (description, hunger, happiness, energy, is_sleeping, seconds away)
+SCENARIOS = [
+    ("a minute awake", 80.0, 60.0, 90.0, False, 60.0),
+    ("falls asleep", 80.0, 60.0, 2.0, False, 45.5),
+    ("wakes up", 80.0, 60.0, 40.0, True, 8.25),
+    ("wakes, then awake a while", 80.0, 60.0, 99.0, True, 300.0),
+    ("hunger runs out", 30.0, 90.0, 50.0, False, 1000.0),
+    ("several cycles", 100.0, 100.0, 100.0, False, 3 * 3600.0 + 17.3),
+    ("asleep at exhaustion", 50.0, 50.0, 0.0, False, 12.0),
+]
+
+def tick_path(stats, seconds, is_sleeping, step):
+    """What Cat.update does to the stats, one frame at a time."""
+    frames, remainder = divmod(seconds, step)
+    for dt in [step] * int(frames) + ([remainder] if remainder > 0 else []):
+        if stats.is_exhausted() and not is_sleeping:
+            is_sleeping = True
+        if is_sleeping and stats.is_fully_rested():
+            is_sleeping = False
+        stats.update(dt, is_sleeping=is_sleeping)
+    return is_sleeping
+
+def run(description, hunger, happiness, energy, is_sleeping, seconds, step):
+    initial = {"hunger": hunger, "happiness": happiness, "energy": energy}
+    ticked, closed = CatStats(initial), CatStats(initial)
+
+    start = time.perf_counter()
+    ticked_sleeping = tick_path(ticked, seconds, is_sleeping, step)
+    tick_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    closed_sleeping = closed.advance(seconds, is_sleeping, step)
+    closed_ms = (time.perf_counter() - start) * 1000
+
+    # Both paths add the same per-frame amounts, but one sums them and the
+    # other multiplies, so allow float rounding plus the odd frame at a
+    # phase boundary where rounding decides which tick clamps the bar.
+    energy_tolerance = 2 * max(ENERGY_DECAY_RATE, ENERGY_REPLENISH_RATE) * step
+    errors = {
+        "hunger": abs(ticked.hunger - closed.hunger),
+        "happiness": abs(ticked.happiness - closed.happiness),
+        "energy": abs(ticked.energy - closed.energy),
+    }
+    # Sleep states may only differ if the bar ended right on empty or full.
+    at_boundary = min(closed.energy, closed.max_stat - closed.energy) <= energy_tolerance
+    ok = ((closed_sleeping == ticked_sleeping or at_boundary) and errors["hunger"] < 1e-6
+          and errors["happiness"] < 1e-6 and errors["energy"] <= energy_tolerance)
+    print(f"{'ok ' if ok else 'BAD'} {description:<28} {seconds:>10.1f}s  "
+          f"energy {closed.energy:7.3f} (err {errors['energy']:.2e})  asleep {closed_sleeping!s:<5}  "
+          f"ticks {tick_ms:9.1f} ms  closed form {closed_ms:.3f} ms")
+    return ok
+
+def check_new_game(backend):
+    """An old save three days back, then Continue (caught up) and New Game (not)."""
+    three_days = 3 * 86400.0
+    with tempfile.TemporaryDirectory() as saves:
+        save_manager.close()
+        save_manager.SAVES_DIR = Path(saves)
+        save_manager.SAVE_FILE = save_manager.SAVES_DIR / "savegame.dat"
+        save_manager.JSON_SAVE_FILE = save_manager.SAVES_DIR / "savegame.json"
+        save_manager.SAVE_DB = save_manager.SAVES_DIR / "saves.db"
+        save_manager.SAVE_BACKEND = backend
+
+        old_cat = {"cat_id": "custom_cat", "name": "Old", "hunger": 90.0, "happiness": 90.0, "energy": 90.0}
+        save_manager.save_game(old_cat)
+        save_manager.close()
+        old_time = time.time() - three_days
+        if backend == "sqlite":
+            store = save_manager._get_backend().store
+            with store._connection as db:
+                db.execute("UPDATE cats SET updated_at = ?", (old_time,))
+        else:
+            os.utime(save_manager.SAVE_FILE, (old_time, old_time))
+
+        from scenes.cat_home import CatHomeScene
+        game = types.SimpleNamespace(cat_data=None, cat_id=None, cat_saved_at=None)
+        cat, saved_at = CatHomeScene.initial_cat(game)
+        continued = cat["name"] == "Old" and saved_at is not None and abs(time.time() - saved_at - three_days) < 60
+
+        # What CatCustomizationScene._on_confirm passes, then what on_enter saves
+        new_cat = {"cat_id": uuid.uuid4().hex, "hunger": 80.0, "happiness": 60.0, "energy": 100.0}
+        cat, saved_at = CatHomeScene.initial_cat(game, new_cat)
+        stats = CatStats(cat)
+        if saved_at:
+            stats.advance(time.time() - saved_at, False)
+        save_manager.new_game(cat)
+        save_manager.flush()
+        save = save_manager.open_save()
+        new_game = (saved_at is None and stats.to_dict() == {"hunger": 80.0, "happiness": 60.0, "energy": 100.0}
+                    and [save.cat_id(i) for i in range(len(save))] == [new_cat["cat_id"]]
+                    and time.time() - save_manager.saved_at(new_cat["cat_id"]) < 60)
+        save_manager.close()
+
+    ok = continued and new_game
+    print(f"{'ok ' if ok else 'BAD'} {backend} save: continue catches up {continued}, new game over it starts fresh {new_game}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare closed-form offline progression with ticking.")
+    parser.add_argument("--fps", type=float, default=SIM_HZ, help="tick rate to compare against")
+    parser.add_argument("--days", type=float, default=0, help="also run a scenario this many days long")
+    args = parser.parse_args()
+
+    step = 1 / args.fps
+    scenarios = list(SCENARIOS)
+    if args.days:
+        scenarios.append((f"{args.days:g} days away", 100.0, 100.0, 73.0, False, args.days * 86400.0))
+    results = [run(*scenario, step) for scenario in scenarios]
+    if not all(results):
+        raise SystemExit("closed-form progression disagrees with ticking")
+    if not all([check_new_game("file"), check_new_game("sqlite")]):
+        raise SystemExit("offline progression applied to the wrong cat")
+    print("all scenarios match")
+
+if __name__ == "__main__":
+    main()
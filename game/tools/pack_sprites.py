@@ -0,0 +1,89 @@
+# game/tools/pack_sprites.py
+"""
+Packs the loose layer PNGs of a cat body type into one sprite sheet plus a
+JSON index, which CatRenderer loads in a single decode when present.
+
+Run from the game directory:
+    python -m tools.pack_sprites shorthair
+    python -m tools.pack_sprites --all
+"""
+
+import argparse
+import json
+import pygame
+
+from settings import SHEET_INDEX_NAME, SHEET_IMAGE_NAME, SHEET_MAX_WIDTH
+from core.resource_manager import resources
+
+CATS_PATH = "images/cats/custom"
+
+def collect_frames(body_dir):
+    """Returns {name: surface} for every loose PNG under a body type directory."""
+    frames = {}
+    for png in sorted(body_dir.rglob("*.png")):
+        name = png.relative_to(body_dir).as_posix()
+        if name == SHEET_IMAGE_NAME:
+            continue
+        frames[name] = pygame.image.load(str(png))
+    return frames
+
+def pack(frames, max_width=SHEET_MAX_WIDTH, padding=1):
+    """
+    Places frames on shelves, tallest first.
+    Returns ({name: [x, y, w, h]}, (sheet_width, sheet_height)).
+    """
+    placements = {}
+    x = y = shelf_height = sheet_width = 0
+    for name in sorted(frames, key=lambda n: (-frames[n].get_height(), n)):
+        width, height = frames[name].get_size()
+        if x and x + width > max_width:
+            # Start a new shelf
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        placements[name] = [x, y, width, height]
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        sheet_width = max(sheet_width, x - padding)
+    return placements, (sheet_width, y + shelf_height)
+
+def pack_body_type(body_type):
+    """Builds sheet.png and sheet.json for one body type directory."""
+    body_dir = resources.assets_path / CATS_PATH / body_type
+    frames = collect_frames(body_dir)
+    if not frames:
+        print(f"No PNG layers found in {body_dir}")
+        return False
+
+    placements, size = pack(frames)
+    sheet = pygame.Surface(size, pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for name, (x, y, _, _) in placements.items():
+        # Copy the pixels as they are, alpha included
+        sheet.blit(frames[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+    pygame.image.save(sheet, str(body_dir / SHEET_IMAGE_NAME))
+    with open(body_dir / SHEET_INDEX_NAME, "w") as f:
+        json.dump({"version": 1, "image": SHEET_IMAGE_NAME, "frames": placements}, f, indent=4, sort_keys=True)
+
+    print(f"Packed {len(frames)} layers of '{body_type}' into a {size[0]}x{size[1]} sheet")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack cat layer PNGs into sprite sheets.")
+    parser.add_argument("body_types", nargs="*", help="Body types to pack, e.g. shorthair")
+    parser.add_argument("--all", action="store_true", help="Pack every body type directory")
+    args = parser.parse_args()
+
+    body_types = args.body_types
+    if args.all:
+        body_types = sorted(p.name for p in (resources.assets_path / CATS_PATH).iterdir() if p.is_dir())
+    if not body_types:
+        parser.error("Name at least one body type or pass --all")
+
+    pygame.init()
+    for body_type in body_types:
+        pack_body_type(body_type)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# game/tools/simulate.py
+"""
+Runs days of cat life in seconds, with no window and no sound, to look
+for stat and state-machine bugs (sleeping, waking, idle animations) and
+to measure simulation throughput.
+
+Cats are built headless (no images are loaded or composed) and stepped
+the way CatHomeScene steps them: the scene's timers, then Cat.update,
+then one stat_engine.step for all cats. Nothing is drawn. A random
+player feeds, pets, pokes, walks and beds the cats now and then.
+
+Run from the game directory:
+    python -m tools.simulate --days 3
+    python -m tools.simulate --days 30 --speed 10 --cats 50 --no-player
+"""
+
+import os
+
+# Before pygame starts: no window, no audio device.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import logging
+import math
+import random
+import time
+from collections import Counter
+
+from core.sound_manager import sounds
+from core.timers import TimerService
+from entities.cat import Cat
+from entities.components.stat_engine import stat_engine
+import core.save_manager as save_manager
+from settings import SIM_HZ, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Where CatHomeScene puts the floor and the bed, roughly
+FLOOR_Y = SCREEN_HEIGHT * 0.63
+BED = (SCREEN_WIDTH / 2 + 450, SCREEN_HEIGHT * 0.60)
+
+# How often the simulated player does each thing, per simulated hour
+PLAYER_RATES = {"feed": 4, "pet": 6, "poke": 3, "bed": 2, "walk": 12}
+
+class Simulation:
+    """Headless cats plus the parts of CatHomeScene.update that aren't drawing."""
+
+    def __init__(self, cat_count, initial_stats, player, rng):
+        self.timers = TimerService()
+        self.rng = rng
+        self.player = player
+        self.cats = []
+        for _ in range(cat_count):
+            cat = Cat(position=(SCREEN_WIDTH / 2, FLOOR_Y), initial_stats=initial_stats,
+                      sleep_scale=0.25, timers=self.timers, headless=True)
+            cat.bed_world_x, cat.bed_world_y = BED
+            if initial_stats.get("is_sleeping"):
+                cat.start_sleeping(*BED)
+            self.cats.append(cat)
+
+        self.time = 0.0
+        self.ticks = 0
+        self.transitions = Counter()
+        self.events = Counter()
+        self.violations = Counter()
+        self.first_violations = []
+        # Per cat: (state, is_blinking, is_playing_idle_sequence) after the last tick
+        self._previous = [self._observe(cat) for cat in self.cats]
+        # Per cat: consecutive ticks spent awake at 0 energy / asleep at full energy
+        self._stuck = [[0, 0] for _ in self.cats]
+
+    @staticmethod
+    def _observe(cat):
+        return cat.current_state(), cat.interactions.is_blinking, cat.interactions.is_playing_idle_sequence
+
+    def step(self, dt):
+        self.timers.update(dt)
+        if self.player:
+            for cat in self.cats:
+                self._play(cat, dt)
+        for cat in self.cats:
+            was_sleeping = cat.is_sleeping()
+            cat.update(dt, batched=True)
+            if was_sleeping and not cat.is_sleeping():
+                cat.set_position(cat.position[0], FLOOR_Y)
+        stat_engine.step(dt)
+        self.time += dt
+        self.ticks += 1
+        for i, cat in enumerate(self.cats):
+            self._record(i, cat)
+
+    def _chance(self, action, dt):
+        return self.rng.random() < PLAYER_RATES[action] * dt / 3600
+
+    def _play(self, cat, dt):
+        """Maybe does one thing to the cat, as a player clicking around might."""
+        if cat.is_sleeping():
+            if self._chance("poke", dt) and cat.poke():
+                self.events["woken by poke"] += 1
+                cat.set_position(SCREEN_WIDTH / 2, FLOOR_Y)
+        elif self._chance("feed", dt):
+            cat.feed()
+            self.events["fed"] += 1
+        elif self._chance("bed", dt) and cat.can_sleep():
+            cat.start_sleeping(*BED)
+            self.events["put to bed"] += 1
+        elif self._chance("walk", dt):
+            cat.behavior.move_to(self.rng.uniform(100, SCREEN_WIDTH - 100), FLOOR_Y)
+        if not cat.interactions.is_being_petted and self._chance("pet", dt):
+            cat.interactions.is_being_petted = True
+            self.timers.after(self.rng.uniform(1, 10), self._stop_petting, cat)
+            self.events["petted"] += 1
+
+    @staticmethod
+    def _stop_petting(cat):
+        cat.interactions.is_being_petted = False
+
+    def _record(self, i, cat):
+        state, blinking, idle_sequence = self._observe(cat)
+        previous_state, was_blinking, was_idle_sequence = self._previous[i]
+        self._previous[i] = (state, blinking, idle_sequence)
+        if state != previous_state:
+            self.transitions[f"{previous_state} -> {state}"] += 1
+        if blinking and not was_blinking:
+            self.events["blinks"] += 1
+        if idle_sequence and not was_idle_sequence:
+            self.events["idle sequences"] += 1
+        self._check(i, cat)
+
+    def _check(self, i, cat):
+        """Records anything the cat should never be doing."""
+        stats = cat.stats
+        for name in ("hunger", "happiness", "energy"):
+            value = getattr(stats, name)
+            if not (math.isfinite(value) and 0 <= value <= stats.max_stat):
+                self._violation(i, f"{name} out of range", f"{value!r}")
+
+        # Cat.update puts a cat to bed the tick after energy runs out and
+        # wakes it the tick after it's full; never later than that.
+        stuck = self._stuck[i]
+        stuck[0] = stuck[0] + 1 if stats.is_exhausted() and not cat.is_sleeping() else 0
+        stuck[1] = stuck[1] + 1 if stats.is_fully_rested() and cat.is_sleeping() else 0
+        if stuck[0] > 1:
+            self._violation(i, "awake with no energy", f"{stuck[0]} ticks")
+        if stuck[1] > 1:
+            self._violation(i, "asleep when fully rested", f"{stuck[1]} ticks")
+
+        if cat.is_sleeping():
+            if cat.behavior.target_position is not None or tuple(cat.position) != BED:
+                self._violation(i, "moved while asleep", f"at {tuple(cat.position)}")
+            if cat.interactions.is_blinking:
+                self._violation(i, "blinking while asleep", "")
+
+    def _violation(self, i, kind, detail):
+        self.violations[kind] += 1
+        if len(self.first_violations) < 10:
+            self.first_violations.append(f"t={self.time:.2f}s cat {i}: {kind} {detail}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate cats headless and check their states.")
+    parser.add_argument("--days", type=float, default=1.0, help="simulated days to run")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="time multiplier: simulated seconds per 1/SIM_HZ step (above 1 takes coarser steps)")
+    parser.add_argument("--cats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-player", dest="player", action="store_false", help="leave the cats alone")
+    parser.add_argument("--from-save", action="store_true", help="start from the saved cat (the save is only read)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    sounds.disable()
+    # Idle sequences and blinks use the random module directly.
+    random.seed(args.seed)
+    initial_stats = (save_manager.load_cat() or {}) if args.from_save else {}
+
+    sim = Simulation(args.cats, initial_stats, args.player, random.Random(args.seed))
+    dt = args.speed / SIM_HZ
+    ticks = math.ceil(args.days * 86400 / dt)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        sim.step(dt)
+    wall = time.perf_counter() - start
+
+    print(f"{sim.time / 86400:.2f} days, {args.cats} cat(s), {sim.ticks} ticks of {dt * 1000:.1f} ms "
+          f"in {wall:.2f}s: {sim.ticks / wall:,.0f} ticks/s, {sim.time / wall:,.0f}x real time")
+    print("transitions:")
+    for name, count in sorted(sim.transitions.items()):
+        print(f"  {name:<22} {count:>8}")
+    print("events:")
+    for name, count in sorted(sim.events.items()):
+        print(f"  {name:<22} {count:>8}")
+    print("final stats:")
+    for i, cat in enumerate(sim.cats[:5]):
+        stats = cat.stats
+        print(f"  cat {i}: hunger {stats.hunger:6.2f}  happiness {stats.happiness:6.2f}  "
+              f"energy {stats.energy:6.2f}  {cat.current_state().lower()}")
+    if len(sim.cats) > 5:
+        print(f"  ... and {len(sim.cats) - 5} more")
+
+    if sim.violations:
+        print("invariant violations:")
+        for name, count in sorted(sim.violations.items()):
+            print(f"  {name:<26} {count:>8}")
+        for line in sim.first_violations:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print("no invariant violations")
+
+if __name__ == "__main__":
+    main()